@@ -1,9 +1,13 @@
+import os
 import pygame
-import time
 import random
 import json
 import csv
-from modules import settings, display, utils
+from modules import settings, display, utils, engine, replay, autopilot, snapshot
+from modules.renderer import Renderer
+from modules.timestep import FixedTimestep
+from modules.profiler import FrameProfiler
+from modules.assets import Assets
 
 try:
     # Inicializar pygame
@@ -26,17 +30,25 @@ try:
     pygame.display.set_caption('Snake Game')
     game_window = pygame.display.set_mode((config['window_x'], config['window_y']))
 
-    # Función para cargar y actualizar la configuración después de la pantalla de inicio
-    def reload_settings():
+    def on_settings_changed(changes):
         """
-        Recarga la configuración del juego y actualiza los obstáculos estáticos y los enemigos en movimiento.
+        Aplica a `config` los ajustes que cambiaron, por ejemplo al elegir una dificultad en el menú.
 
-        Esta función recarga la configuración del juego llamando a la función `load_game_settings()`.
-        Después actualiza la variable global `config` con los nuevos ajustes.
+        Parameters:
+            changes (dict): Los ajustes que cambiaron, por clave.
+        """
+        config.update(changes)
+
+    # Los ajustes se leen una sola vez; los cambios del menú llegan por este aviso, sin volver a leer el archivo
+    settings.get_settings().add_listener(on_settings_changed)
 
-        Además, llama a las funciones `create_obstacles()` y `create_moving_enemies()` del módulo `utils
-        del módulo `utils` para generar nuevos obstáculos estáticos y enemigos en movimiento basados en
-        el tamaño actualizado de la ventana y el número de obstáculos y enemigos.
+    def new_game():
+        """
+        Crea una partida nueva con la configuración actual.
+
+        Crea un `engine.GameState` nuevo con una semilla aleatoria, que genera los obstáculos estáticos
+        según el tamaño de la ventana y el número de obstáculos de la dificultad elegida, y empieza a
+        grabar la partida con `replay.Recorder`.
 
         Parameters:
             None
@@ -44,86 +56,128 @@ try:
         Returns:
             None
         """
-        global config, static_obstacles
-        config = load_game_settings()
-        static_obstacles = utils.create_obstacles(config['window_x'], config['window_y'], config['num_obstacles'])
+        global game_state, change_to, recorder
+        seed = random.randrange(2 ** 32)
+        game_state = engine.GameState(config, seed)
+        recorder = replay.Recorder(config, seed)
+        change_to = 'RIGHT'
 
-    # Cargar imagen de fondo y sonidos
-    background_image = pygame.image.load(config['background_image']).convert()
-    background_menu = pygame.image.load(config['background_menu']).convert()
-    pygame.mixer.music.load(config['background_music'])
-    lose_life_sound = pygame.mixer.Sound(config['lose_life_sound'])
-    fruit_sound = pygame.mixer.Sound(config['fruit_sound'])
-    power_up_sound = pygame.mixer.Sound(config['power_up_sound'])
+    def resume_game():
+        """
+        Retoma la partida que quedó a medias al cerrar la ventana, guardada en `save_file` con `snapshot`.
 
-    # Iniciar música de fondo
-    pygame.mixer.music.play(-1)
+        La grabación sigue desde la que se guardó en `replay_dir`, así que la repetición cubre la
+        partida completa. El archivo se borra: cada partida guardada se retoma una sola vez. Si el
+        archivo no se puede cargar se borra igual y se empieza una partida nueva, para que un archivo
+        dañado no impida jugar en los inicios siguientes.
 
-    # Configurar volumen inicial
-    pygame.mixer.music.set_volume(0.1)
-    lose_life_sound.set_volume(0.2)
-    fruit_sound.set_volume(0.2)
-    power_up_sound.set_volume(0.2)
+        Parameters:
+            None
 
-    # Controlador de FPS
-    fps = pygame.time.Clock()
+        Returns:
+            None
+        """
+        global game_state, change_to, recorder
+        try:
+            game_state = snapshot.load(config['save_file'])
+        except Exception as e:
+            print(f"Could not resume the saved game: {e}")
+            os.remove(config['save_file'])
+            new_game()
+            return
+        os.remove(config['save_file'])
+
+        # Sin la grabación anterior (o si está dañada) se graba desde aquí: la repetición queda incompleta
+        recording_file = f"{config['replay_dir']}/replay_{game_state.seed}.json"
+        try:
+            recorder = replay.Recorder.from_recording(replay.load(recording_file))
+            change_to = recorder.last
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            recorder = replay.Recorder(config, game_state.seed)
+            change_to = game_state.direction
+
+    def save_session(profiler=None):
+        """
+        Guarda la grabación de la partida en curso en la carpeta `replay_dir` de la configuración
+        y, si la medición está activada, exporta los tiempos por cuadro a `profile_output`.
+        """
+        recorder.save(f"{config['replay_dir']}/replay_{recorder.seed}.json")
+        if profiler:
+            profiler.export(config['profile_output'])
 
-    # Posición inicial del jugador
-    player_position = [100, 50]
-    player_body = [[100, 50]]
+    # Las imágenes y los sonidos se cargan en segundo plano mientras se muestra el menú; la imagen del
+    # menú va primero porque es la que se necesita enseguida
+    assets = Assets(config['asset_cache_dir'])
+    assets.preload(images=[config['background_menu'], config['background_image']],
+                   sounds=[config['fruit_sound'], config['power_up_sound'], config['lose_life_sound']])
 
-    # Posición inicial de la fruita y power-up
-    fruit_position, power_up_position = utils.spawn_item(config['window_x'], config['window_y']), utils.spawn_item(config['window_x'], config['window_y'])
-    fruit_spawn, power_up_spawn = True, True
-    power_up_active, power_up_end_time = False, 0
+    # Iniciar música de fondo con el volumen inicial; si falta el archivo el juego sigue sin música
+    assets.play_music(config['background_music'], 0.1)
 
-    # Dirección inicial del jugador
-    direction, change_to = 'RIGHT', 'RIGHT'
+    def load_sounds():
+        """
+        Devuelve los sonidos de la partida por evento de `engine.GameState.step()`, con su volumen inicial.
 
-    # Puntaje inicial
-    score, lives = 0, config['initial_lives']
+        Los sonidos se cargan una sola vez; las llamadas siguientes devuelven los mismos objetos.
+        """
+        sounds = {
+            'fruit': assets.sound(config['fruit_sound']),
+            'power_up_spawn': assets.sound(config['power_up_sound']),
+            'lose_life': assets.sound(config['lose_life_sound']),
+        }
+        for sound in sounds.values():
+            sound.set_volume(0.2)
+        return sounds
 
-    # Obstáculos
-    static_obstacles = utils.create_obstacles(config['window_x'], config['window_y'], config['num_obstacles'])
+    # Controlador de FPS
+    fps = pygame.time.Clock()
 
-    # Temporizador de obstáculos
-    obstacles_hidden = False
-    obstacles_show_time = 0
+    # Dirección pedida por el jugador y partida en curso
+    change_to = 'RIGHT'
+    game_state = None
+    recorder = None
 
-    # Función principal del juego
-    def main():
+    def play_round(renderer, profiler=None):
         """
-        La función principal que ejecuta el bucle del juego.
+        Juega una partida, de la primera tecla hasta la pantalla de fin de partida.
 
-        Esta función inicializa la ventana del juego, carga los ajustes del juego y comienza el bucle del juego.
-        Continuamente maneja eventos, actualiza el estado del juego, y renderiza el juego en la pantalla.
+        Usa la partida creada por `new_game()` y la ventana, las imágenes y los sonidos ya
+        cargados, así que volver a jugar no cuesta más que crear un `engine.GameState` nuevo.
 
         Parameters:
-        None
+            renderer (Renderer): El dibujante de la partida, compartido entre partidas.
+            profiler (FrameProfiler, optional): La medición por cuadro, si está activada.
 
         Returns:
-        None
-
-        Efectos secundarios:
-        - Inicializa la ventana del juego y establece el título.
-        - Carga los ajustes del juego y actualiza la configuración del juego.
-        - Inicia el bucle del juego y maneja los eventos, actualizando el estado del juego, y renderizando el juego en la pantalla.
+            None
 
         Raises:
         - pygame.error: Si se produce un error durante el bucle de juego.
         - Excepción: Si hay un error inesperado durante el bucle del juego.
         """
-        global player_position, player_body, direction, change_to, score, lives, fruit_spawn, fruit_position, power_up_spawn, power_up_position, power_up_active, power_up_end_time, obstacles_hidden, obstacles_show_time
+        global change_to
+        sounds = load_sounds()
+        # Con el piloto automático la dirección la elige la búsqueda de caminos; la tecla 'p' lo alterna
+        pilot = autopilot.Autopilot() if config['autopilot'] else None
 
-        display.start_screen(game_window, config['window_x'], config['window_y'], background_menu)
-
-        # Cargar la configuración nuevamente después de la pantalla de inicio
-        reload_settings()
+        # La simulación avanza a `player_speed` ticks por segundo y la ventana se dibuja hasta `render_fps`
+        timestep = FixedTimestep(config['player_speed'])
+        fps.tick()
 
         while True:
             try:
+                # El cuadro se mide desde antes de `Clock.tick`, así que 'frame' incluye la espera
+                if profiler:
+                    profiler.start_frame()
+                elapsed = fps.tick(config['render_fps']) / 1000
+                if profiler:
+                    profiler.mark()
+
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
+                        save_session(profiler)
+                        # La partida a medias se guarda para retomarla la próxima vez que se abra el juego
+                        snapshot.save(game_state, config['save_file'])
                         pygame.quit()
                         quit()
                     elif event.type == pygame.KEYDOWN:
@@ -135,84 +189,38 @@ try:
                             change_to = 'LEFT'
                         if event.key == pygame.K_RIGHT or event.key == ord('d'):
                             change_to = 'RIGHT'
+                        if event.key == ord('p'):
+                            pilot = None if pilot else autopilot.Autopilot()
+                if profiler:
+                    profiler.lap('events')
+
+                for _ in range(timestep.advance(elapsed)):
+                    if pilot:
+                        change_to = pilot.choose(game_state)
+                    recorder.record(game_state.tick + 1, change_to)
+                    for game_event in game_state.step(change_to):
+                        if game_event in sounds:
+                            sounds[game_event].play()
+                    if game_state.game_over:
+                        break
+                if profiler:
+                    profiler.lap('simulation')
+
+                dirty_rects = renderer.draw(game_state)
+
+                # La partida termina al perder todas las vidas o al chocar contra un limite de la ventana
+                if game_state.game_over:
+                    save_session(profiler)
+                    if utils.display_game_over(game_window, game_state.score, config['window_x'], config['window_y']):
+                        pygame.quit()
+                        quit()
+                    return
 
-                direction = utils.validate_direction(change_to, direction)
-                player_position = utils.move_player(player_position, direction)
-
-                player_body.insert(0, list(player_position))
-                if player_position == fruit_position:
-                    score += 10
-                    fruit_spawn = False
-                    fruit_sound.play()
-                else:
-                    player_body.pop()
-
-                if not fruit_spawn:
-                    fruit_position = utils.spawn_item(config['window_x'], config['window_y'])
-                    fruit_spawn = True
-
-                if power_up_spawn:
-                    power_up_position = utils.spawn_item(config['window_x'], config['window_y'])
-                    power_up_spawn = False
-                    power_up_sound.play()
-
-                if player_position == power_up_position:
-                    power_up_active = True
-                    power_up_end_time = time.time() + config['power_up_duration']
-                    power_up_spawn = True
-                    obstacles_hidden = True
-                    obstacles_show_time = time.time() + config['power_up_duration']
-
-                if power_up_active and time.time() > power_up_end_time:
-                    power_up_active = False
-
-                if obstacles_hidden and time.time() > obstacles_show_time:
-                    obstacles_hidden = False
-
-                game_window.fill(settings.colors['black'])
-                game_window.blit(background_image, [0, 0])
-
-                for pos in player_body:
-                    pygame.draw.rect(game_window, config['player_color'], pygame.Rect(pos[0], pos[1], 10, 10))
-                    pygame.draw.rect(game_window, settings.colors['white'], pygame.Rect(fruit_position[0], fruit_position[1], 10, 10))
-
-                # Vuelvo a dibujar el power up
-                if not power_up_spawn:
-                    pygame.draw.rect(game_window, settings.colors['yellow'], pygame.Rect(power_up_position[0], power_up_position[1], 10, 10))
-
-                if not obstacles_hidden:
-                    for obstacle in static_obstacles:
-                        pygame.draw.rect(game_window, settings.colors['red'], pygame.Rect(obstacle[0], obstacle[1], 10, 10))
-                        if player_position == obstacle:
-                            lives = utils.lose_life(lose_life_sound, lives)
-                            if lives == 0:
-                                utils.display_game_over(game_window, score, config['window_x'], config['window_y'])
-
-                # for enemy in moving_enemies:
-                #     pygame.draw.rect(game_window, settings.colors['blue'], pygame.Rect(enemy["position"][0], enemy["position"][1], 10, 10))
-                #     if player_position == enemy["position"]:
-                #         lives = utils.lose_life(lose_life_sound, lives)
-                #         if lives == 0:
-                #             utils.display_game_over(game_window, score, config['window_x'], config['window_y'])
-
-                # moving_enemies = utils.move_enemies(moving_enemies, config['window_x'])
-
-                # Pierdo todas las vidas si se colisiona contra algun limite de la ventana
-                if utils.check_collision(player_position, config['window_x'], config['window_y']):
-                    lose_life_sound.play()
-                    utils.display_game_over(game_window, score, config['window_x'], config['window_y'])
-
-                for block in player_body[1:]:
-                    if player_position == block:
-                        lives = utils.lose_life(lose_life_sound, lives)
-                        if lives == 0:
-                            utils.display_game_over(game_window, score, config['window_x'], config['window_y'])
-
-                display.show_score(game_window, score, settings.colors['white'], 'times new roman', 20)
-                display.show_lives(game_window, lives, settings.colors['white'], 'times new roman', 20, config['window_x'])
-
-                pygame.display.update()
-                fps.tick(config['player_speed'])
+                # Solo se envían a la pantalla las áreas que cambiaron
+                pygame.display.update(dirty_rects)
+                if profiler:
+                    profiler.lap('display_update')
+                    profiler.end_frame()
 
             except pygame.error as e:
                 print(f"Pygame error during game loop: {e}")
@@ -223,6 +231,44 @@ try:
                 pygame.quit()
                 quit()
 
+    # Función principal del juego
+    def main():
+        """
+        La función principal que ejecuta las sesiones de juego.
+
+        Cada sesión pasa por el menú de inicio, una partida y la pantalla de fin de partida, y vuelve al
+        menú. La ventana, las imágenes y los sonidos se cargan una sola vez por proceso; entre
+        partidas solo se crea una partida nueva con los ajustes elegidos en el menú.
+
+        Parameters:
+        None
+
+        Returns:
+        None
+
+        Efectos secundarios:
+        - Muestra el menú de inicio antes de cada partida; la primera vez, mientras las imágenes y los
+          sonidos terminan de cargarse en segundo plano.
+        - Crea una partida nueva con los ajustes elegidos, o retoma la que quedó guardada al cerrar la ventana.
+        - Juega la partida con `play_round()` hasta que termine o se cierre la ventana.
+        """
+        # Medición opcional de cada sección del cuadro, con resumen en pantalla
+        profiler = FrameProfiler() if config['profiling'] else None
+        renderer = None
+
+        while True:
+            background_menu = assets.image(config['background_menu'])
+            display.start_screen(game_window, config['window_x'], config['window_y'], background_menu)
+
+            # La configuración ya incluye lo elegido en el menú; una partida guardada se retoma tal como quedó
+            if os.path.exists(config['save_file']):
+                resume_game()
+            else:
+                new_game()
+            if renderer is None:
+                renderer = Renderer(game_window, assets.image(config['background_image']), config['player_color'], profiler)
+            play_round(renderer, profiler)
+
     if __name__ == "__main__":
         main()
 
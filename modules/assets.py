@@ -0,0 +1,176 @@
+import hashlib
+import io
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+# Cabecera de los archivos del caché en disco: marca, versión, ancho, alto y si hay canal alfa
+CACHE_HEADER = struct.Struct('<4sHIIB')
+CACHE_MAGIC = b'SNKS'
+CACHE_VERSION = 1
+
+class SilentSound:
+    """
+    Reemplazo de pygame.mixer.Sound para los sonidos que no se pudieron cargar: no hace nada.
+    """
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+class Assets:
+    """
+    Carga las imágenes y los sonidos del juego la primera vez que se usan y los conserva.
+
+    Las imágenes decodificadas (y escaladas, si se pide un tamaño) se guardan además en `cache_dir`
+    como píxeles sin comprimir, en archivos cuyo nombre incluye un hash del contenido de la imagen
+    original y el tamaño pedido: en los arranques siguientes se leen directamente, sin decodificar el
+    JPEG, y si la imagen cambia el hash cambia y se vuelve a generar.
+
+    `preload()` adelanta la carga en un hilo mientras se muestra el menú. La conversión al formato de
+    la ventana (`convert()`/`convert_alpha()`) se hace siempre en el hilo principal, al pedir la imagen.
+    """
+
+    def __init__(self, cache_dir='./.asset_cache'):
+        """
+        Args:
+            cache_dir (str, optional): La carpeta del caché de imágenes. Por defecto './.asset_cache'.
+        """
+        self.cache_dir = cache_dir
+        self.surfaces = {}
+        self.sounds = {}
+        # Cargas adelantadas todavía no reclamadas, por clave
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def preload(self, images=(), sounds=(), size=None):
+        """
+        Empieza a cargar imágenes y sonidos en un hilo, en el orden dado, sin esperar a que terminen.
+
+        Args:
+            images (list, optional): Las rutas de las imágenes.
+            sounds (list, optional): Las rutas de los sonidos.
+            size (tuple, optional): El tamaño al que se escalan las imágenes. Por defecto el original.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='assets')
+        with self.lock:
+            for path in images:
+                key = ('image', path, size)
+                if key not in self.surfaces and key not in self.pending:
+                    self.pending[key] = self.executor.submit(self._load_pixels, path, size)
+            for path in sounds:
+                key = ('sound', path)
+                if path not in self.sounds and key not in self.pending:
+                    self.pending[key] = self.executor.submit(self._load_sound, path)
+
+    def image(self, path, size=None):
+        """
+        Devuelve una imagen convertida al formato de la ventana, cargándola solo la primera vez.
+
+        Args:
+            path (str): La ruta de la imagen.
+            size (tuple, optional): El tamaño al que se escala la imagen. Por defecto el original.
+
+        Returns:
+            pygame.Surface: La imagen, lista para hacer blit.
+        """
+        key = ('image', path, size)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            pixels = self._claim(key, self._load_pixels, path, size)
+            surface = pixels.convert_alpha() if pixels.get_flags() & pygame.SRCALPHA else pixels.convert()
+            self.surfaces[key] = surface
+        return surface
+
+    def sound(self, path):
+        """
+        Devuelve un sonido, cargándolo solo la primera vez.
+
+        Returns:
+            pygame.mixer.Sound: El sonido, o un `SilentSound` si el archivo no existe o no hay mixer.
+        """
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = self.sounds[path] = self._claim(('sound', path), self._load_sound, path)
+        return sound
+
+    def play_music(self, path, volume, loops=-1):
+        """
+        Carga y reproduce la música de fondo. Si el archivo no existe el juego sigue sin música.
+
+        Returns:
+            bool: True si la música empezó a sonar.
+        """
+        try:
+            pygame.mixer.music.load(path)
+        except (FileNotFoundError, pygame.error) as e:
+            print(f"Music not available: {path} ({e})")
+            return False
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops)
+        return True
+
+    def _claim(self, key, loader, *args):
+        # Si la carga estaba adelantada se espera su resultado; si no, se carga en este hilo
+        with self.lock:
+            future = self.pending.pop(key, None)
+        if future is not None:
+            return future.result()
+        return loader(*args)
+
+    def _load_sound(self, path):
+        try:
+            return pygame.mixer.Sound(path)
+        except (FileNotFoundError, pygame.error) as e:
+            print(f"Sound not available: {path} ({e})")
+            return SilentSound()
+
+    def _load_pixels(self, path, size):
+        with open(path, 'rb') as file:
+            data = file.read()
+        digest = hashlib.sha1(data).hexdigest()[:16]
+        label = 'original' if size is None else f'{size[0]}x{size[1]}'
+        cache_file = os.path.join(self.cache_dir, f'{os.path.basename(path)}-{digest}-{label}.surface')
+
+        surface = self._read_cache(cache_file)
+        if surface is None:
+            surface = pygame.image.load(io.BytesIO(data), path)
+            if size is not None and surface.get_size() != tuple(size):
+                surface = pygame.transform.scale(surface, size)
+            self._write_cache(cache_file, surface)
+        return surface
+
+    def _read_cache(self, cache_file):
+        try:
+            with open(cache_file, 'rb') as file:
+                data = file.read()
+            magic, version, width, height, alpha = CACHE_HEADER.unpack_from(data)
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                return None
+            return pygame.image.fromstring(data[CACHE_HEADER.size:], (width, height), 'RGBA' if alpha else 'RGB')
+        except (OSError, struct.error, ValueError):
+            # Sin caché, o un archivo incompleto: se vuelve a decodificar la imagen original
+            return None
+
+    def _write_cache(self, cache_file, surface):
+        alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+        header = CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, surface.get_width(), surface.get_height(), alpha)
+        temporary = f'{cache_file}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temporary, 'wb') as file:
+                file.write(header)
+                file.write(pygame.image.tostring(surface, 'RGBA' if alpha else 'RGB'))
+            # Se reemplaza de una vez para que otro proceso nunca lea un archivo a medio escribir
+            os.replace(temporary, cache_file)
+        except OSError as e:
+            print(f"Error caching {cache_file}: {e}")
@@ -0,0 +1,180 @@
+import heapq
+from array import array
+from collections import deque
+from modules import policies
+
+# Ticks que se sigue a `policies.choose` después de una búsqueda sin camino antes de volver a buscar;
+# la espera se duplica con cada búsqueda fallida seguida hasta `MAX_RETRY_TICKS`
+RETRY_TICKS = 10
+MAX_RETRY_TICKS = 640
+
+class Autopilot:
+    """
+    Jugador automático que sigue el camino más corto hasta la fruta.
+
+    El camino se busca con A* (distancia Manhattan) sobre la `grid.OccupancyGrid` de la partida,
+    evitando los obstáculos visibles, el cuerpo y las celdas a las que están por llegar los enemigos.
+    En lugar de buscar en cada tick se conserva el camino y solo se comprueba que la próxima celda siga
+    libre: se vuelve a buscar cuando la fruta cambia de lugar, cuando los obstáculos se ocultan o
+    reaparecen, cuando la cabeza no está donde el camino esperaba o cuando la próxima celda se ocupó.
+    Si no hay camino se recurre a `policies.choose` durante `RETRY_TICKS` ticks (el doble tras cada
+    fallo seguido) antes de buscar otra vez, para no recorrer en cada tick toda la región alcanzable
+    cuando la fruta quedó encerrada.
+
+    Attributes:
+        plans (int): Cuántas búsquedas se hicieron desde que se creó.
+    """
+
+    def __init__(self):
+        self.state = None
+        self.path = deque()
+        self.head = None
+        self.target = None
+        self.obstacles_hidden = None
+        self.retry_tick = None
+        self.retry_ticks = RETRY_TICKS
+        self.plans = 0
+
+    def choose(self, state):
+        """
+        Elige la dirección para el próximo tick.
+
+        Args:
+            state (engine.GameState): La partida en curso.
+
+        Returns:
+            str: La dirección a seguir: 'UP', 'DOWN', 'LEFT' o 'RIGHT'.
+        """
+        grid = state.grid
+        if state.fruit_position is None:
+            return policies.choose(state)
+        head = grid.cell(state.player_position)
+        target = grid.cell(state.fruit_position)
+        enemy_cells = set(state.enemies.next_cells()) if len(state.enemies) else set()
+
+        changed = state is not self.state or target != self.target or state.obstacles_hidden != self.obstacles_hidden
+        if changed:
+            self.retry_ticks = RETRY_TICKS
+        elif self.retry_tick is not None and state.tick < self.retry_tick:
+            return policies.choose(state)
+        if changed or head != self.head or not self.path or self.blocked(state, self.path[0], enemy_cells):
+            self.state = state
+            self.target = target
+            self.obstacles_hidden = state.obstacles_hidden
+            self.path = self.search(state, head, target, enemy_cells)
+            self.plans += 1
+            if self.path:
+                self.retry_tick, self.retry_ticks = None, RETRY_TICKS
+            else:
+                self.retry_tick = state.tick + self.retry_ticks
+                self.retry_ticks = min(self.retry_ticks * 2, MAX_RETRY_TICKS)
+
+        if not self.path:
+            self.head = None
+            return policies.choose(state)
+        self.head = self.path.popleft()
+        return self.direction(grid, head, self.head)
+
+    def blocked(self, state, cell, enemy_cells):
+        """
+        Indica si la cabeza perdería una vida al entrar en la celda en el próximo tick.
+        """
+        grid = state.grid
+        if cell in enemy_cells:
+            return True
+        if grid.obstacles[cell] and not state.obstacles_hidden:
+            return True
+        # La cola se mueve en el mismo tick, así que su celda queda libre
+        return grid.body[cell] and not (cell == state.player_body[-1] and grid.body[cell] == 1)
+
+    def search(self, state, head, target, enemy_cells):
+        """
+        Busca el camino más corto de la cabeza a la fruta con A*.
+
+        Returns:
+            deque: Las celdas del camino sin la cabeza, o una deque vacía si no hay camino.
+        """
+        grid = state.grid
+        columns, rows, cells = grid.columns, grid.rows, grid.columns * grid.rows
+        # Las mismas condiciones que `blocked()`, en variables locales para el bucle interno
+        body = grid.body
+        obstacles = None if state.obstacles_hidden else grid.obstacles
+        tail = state.player_body[-1] if body[state.player_body[-1]] == 1 else -1
+        target_row, target_column = divmod(target, columns)
+        # La celda detrás de la cabeza no se puede tomar: sería dar media vuelta
+        behind = self.neighbor(grid, head, {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}[state.direction])
+
+        parent = array('i', [-1]) * cells
+        cost = array('i', [-1]) * cells
+        cost[head] = 0
+        # Entradas (f, -g, celda): entre empates se expande primero la más avanzada
+        frontier = [(0, 0, head)]
+        while frontier:
+            _, negative_cost, cell = heapq.heappop(frontier)
+            if cell == target:
+                path = deque()
+                while cell != head:
+                    path.appendleft(cell)
+                    cell = parent[cell]
+                return path
+            if -negative_cost != cost[cell]:
+                continue
+            row, column = divmod(cell, columns)
+            for neighbor in (cell - columns if row > 0 else -1,
+                             cell + columns if row < rows - 1 else -1,
+                             cell - 1 if column > 0 else -1,
+                             cell + 1 if column < columns - 1 else -1):
+                if neighbor < 0 or (cell == head and neighbor == behind):
+                    continue
+                g = -negative_cost + 1
+                if cost[neighbor] != -1 and cost[neighbor] <= g:
+                    continue
+                if (body[neighbor] and neighbor != tail) or (obstacles and obstacles[neighbor]) or neighbor in enemy_cells:
+                    continue
+                cost[neighbor] = g
+                parent[neighbor] = cell
+                neighbor_row, neighbor_column = divmod(neighbor, columns)
+                h = abs(neighbor_row - target_row) + abs(neighbor_column - target_column)
+                heapq.heappush(frontier, (g + h, -g, neighbor))
+        return deque()
+
+    @staticmethod
+    def neighbor(grid, cell, direction):
+        """
+        Devuelve la celda vecina en la dirección dada, o -1 si queda fuera del tablero.
+        """
+        row, column = divmod(cell, grid.columns)
+        if direction == 'UP':
+            return cell - grid.columns if row > 0 else -1
+        if direction == 'DOWN':
+            return cell + grid.columns if row < grid.rows - 1 else -1
+        if direction == 'LEFT':
+            return cell - 1 if column > 0 else -1
+        return cell + 1 if column < grid.columns - 1 else -1
+
+    @staticmethod
+    def direction(grid, cell, following):
+        """
+        Devuelve la dirección que lleva de una celda a una vecina.
+        """
+        difference = following - cell
+        if difference == 1:
+            return 'RIGHT'
+        if difference == -1:
+            return 'LEFT'
+        return 'DOWN' if difference == grid.columns else 'UP'
+
+# Un piloto por proceso para `choose()`: reconoce una partida nueva porque el estado es otro objeto
+_autopilot = Autopilot()
+
+def choose(state):
+    """
+    Política para `tournament`: la dirección que elige el piloto automático del proceso.
+
+    Args:
+        state (engine.GameState): La partida en curso.
+
+    Returns:
+        str: La dirección a seguir: 'UP', 'DOWN', 'LEFT' o 'RIGHT'.
+    """
+    return _autopilot.choose(state)
@@ -0,0 +1,306 @@
+import numpy as np
+from modules.grid import CELL_SIZE
+
+# Códigos de dirección: el índice en DIRECTIONS es el valor guardado en los arreglos
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+OPPOSITE = np.array([1, 0, 3, 2], dtype=np.int8)
+DELTA_X = np.array([0, 0, -1, 1], dtype=np.intp)
+DELTA_Y = np.array([-1, 1, 0, 0], dtype=np.intp)
+
+# Códigos de `death_cause`
+DEATH_CAUSES = (None, 'wall', 'obstacle', 'self', 'enemy')
+
+class BatchEnv:
+    """
+    Muchas partidas de Snake simuladas a la vez con arreglos de NumPy.
+
+    Aplica las mismas reglas que `engine.GameState` (y por lo tanto que `main.main()`), pero cada
+    atributo es un arreglo con una fila por partida y `step()` avanza todas las partidas vivas con
+    operaciones vectorizadas. El cuerpo de cada jugador es un buffer circular de índices de celda y la
+    ocupación es una rejilla por partida, igual que `grid.OccupancyGrid`. Los enemigos se guardan como
+    en `enemies.Enemies`, con una columna por enemigo, y los choques con la cabeza se cuentan
+    comparando sus celdas con la de la cabeza.
+
+    Requiere NumPy, que no es una dependencia del juego interactivo. Los elementos se generan con un
+    `numpy.random.Generator`, así que una misma semilla reproduce el lote completo, pero las partidas
+    no coinciden con las de `GameState` para la misma semilla.
+
+    Attributes:
+        x, y (numpy.ndarray): La columna y la fila de la cabeza de cada jugador.
+        direction (numpy.ndarray): El código de dirección actual (índice en `DIRECTIONS`).
+        occupancy (numpy.ndarray): Los segmentos del cuerpo por celda, de forma (partidas, celdas).
+        obstacles (numpy.ndarray): Los obstáculos por celda, de forma (partidas, celdas).
+        fruit, power_up (numpy.ndarray): La celda de la fruta y del power-up, o -1 si el tablero está lleno.
+        enemy_x, enemy_y (numpy.ndarray): La columna y la fila de cada enemigo, de forma (partidas, enemigos).
+        enemy_dx, enemy_dy (numpy.ndarray): El desplazamiento por tick de cada enemigo.
+        scores, lives, ticks (numpy.ndarray): La puntuación, las vidas y los ticks simulados.
+        alive (numpy.ndarray): True para las partidas que siguen en curso.
+        death_cause (numpy.ndarray): El código de la causa de muerte (índice en `DEATH_CAUSES`).
+    """
+
+    def __init__(self, config, num_games, seed=None):
+        """
+        Crea el lote y empieza todas las partidas.
+
+        Args:
+            config (dict): La configuración cargada desde 'settings.json'.
+            num_games (int): El número de partidas simultáneas.
+            seed (int, optional): La semilla del generador de números aleatorios. Por defecto None.
+        """
+        self.columns = (config['board_x'] or config['window_x']) // CELL_SIZE
+        self.rows = (config['board_y'] or config['window_y']) // CELL_SIZE
+        self.num_obstacles = config['num_obstacles']
+        self.num_enemies = config['num_enemies']
+        self.initial_lives = config['initial_lives']
+        self.power_up_ticks = config['power_up_duration'] * config['player_speed']
+        self.num_games = num_games
+        self.rng = np.random.default_rng(seed)
+
+        cells = self.columns * self.rows
+        # Igual que `utils.spawn_item`: todo menos la primera fila y la primera columna
+        spawnable = np.zeros((self.rows, self.columns), dtype=bool)
+        spawnable[1:, 1:] = True
+        self.spawnable = spawnable.ravel()
+        self.spawn_cells = np.flatnonzero(self.spawnable)
+        self.start_cell = 50 // CELL_SIZE * self.columns + 100 // CELL_SIZE
+
+        # El cuerpo nunca supera el número de celdas, así que el buffer circular no se desborda
+        self.capacity = cells + 1
+        self.body = np.zeros((num_games, self.capacity), dtype=np.int16 if cells < 2 ** 15 else np.int32)
+        self.head_index = np.zeros(num_games, dtype=np.intp)
+        self.length = np.zeros(num_games, dtype=np.intp)
+        self.x = np.zeros(num_games, dtype=np.intp)
+        self.y = np.zeros(num_games, dtype=np.intp)
+        self.direction = np.zeros(num_games, dtype=np.int8)
+        self.occupancy = np.zeros((num_games, cells), dtype=np.uint8)
+        self.obstacles = np.zeros((num_games, cells), dtype=bool)
+        self.fruit = np.full(num_games, -1, dtype=np.intp)
+        self.power_up = np.full(num_games, -1, dtype=np.intp)
+        self.enemy_x = np.zeros((num_games, self.num_enemies), dtype=np.intp)
+        self.enemy_y = np.zeros((num_games, self.num_enemies), dtype=np.intp)
+        self.enemy_dx = np.zeros((num_games, self.num_enemies), dtype=np.intp)
+        self.enemy_dy = np.zeros((num_games, self.num_enemies), dtype=np.intp)
+        self.power_up_spawn = np.zeros(num_games, dtype=bool)
+        self.power_up_active = np.zeros(num_games, dtype=bool)
+        self.obstacles_hidden = np.zeros(num_games, dtype=bool)
+        self.power_up_end = np.zeros(num_games, dtype=np.int64)
+        self.scores = np.zeros(num_games, dtype=np.int64)
+        self.lives = np.zeros(num_games, dtype=np.int64)
+        self.ticks = np.zeros(num_games, dtype=np.int64)
+        self.alive = np.zeros(num_games, dtype=bool)
+        self.death_cause = np.zeros(num_games, dtype=np.int8)
+        self.reset()
+
+    def reset(self, games=None):
+        """
+        Empieza partidas nuevas en las posiciones indicadas.
+
+        Args:
+            games (array_like, optional): Índices o máscara booleana de las partidas a reiniciar. Por defecto todas.
+        """
+        games = self._indices(games)
+        if not games.size:
+            return
+        start = self.start_cell
+        self.body[games, 0] = start
+        self.head_index[games] = 0
+        self.length[games] = 1
+        self.x[games], self.y[games] = start % self.columns, start // self.columns
+        self.direction[games] = DIRECTIONS.index('RIGHT')
+        self.occupancy[games] = 0
+        self.occupancy[games, start] = 1
+
+        # Obstáculos distintos entre las celdas generables libres, uno por ronda con `_spawn`: la memoria
+        # temporal crece con el número de partidas y no con el tamaño del tablero
+        self.obstacles[games] = False
+        self.fruit[games] = -1
+        self.power_up[games] = -1
+        for _ in range(self.num_obstacles):
+            cells = self._spawn(games)
+            placed = cells >= 0
+            if not placed.any():
+                break
+            self.obstacles[games[placed], cells[placed]] = True
+
+        self.fruit[games] = self._spawn(games)
+        self.power_up[games] = self._spawn(games)
+
+        # Igual que `enemies.Enemies`: celdas libres al azar que no se reservan y una dirección al azar.
+        # Sin celdas libres no hay enemigos: quedan fuera del tablero, en (-1, -1) y sin moverse
+        for enemy in range(self.num_enemies):
+            cells = self._spawn(games)
+            present = cells >= 0
+            self.enemy_x[games, enemy] = np.where(present, cells % self.columns, -1)
+            self.enemy_y[games, enemy] = np.where(present, cells // self.columns, -1)
+            direction = self.rng.integers(0, len(DIRECTIONS), games.size)
+            self.enemy_dx[games, enemy] = np.where(present, DELTA_X[direction], 0)
+            self.enemy_dy[games, enemy] = np.where(present, DELTA_Y[direction], 0)
+        self.power_up_spawn[games] = True
+        self.power_up_active[games] = False
+        self.obstacles_hidden[games] = False
+        self.power_up_end[games] = 0
+        self.scores[games] = 0
+        self.lives[games] = self.initial_lives
+        self.ticks[games] = 0
+        self.alive[games] = True
+        self.death_cause[games] = 0
+
+    def step(self, actions):
+        """
+        Avanza un tick todas las partidas vivas.
+
+        Args:
+            actions (array_like): Un código de dirección por partida (índice en `DIRECTIONS`), o -1 para
+                                  mantener la dirección actual. Las partidas terminadas no se modifican.
+
+        Returns:
+            tuple: Tres máscaras booleanas de forma (partidas,): las partidas que comieron la fruta,
+                   las que recibieron un golpe (vida perdida o choque con un límite) y las que terminaron.
+        """
+        n = self.num_games
+        ate_mask = np.zeros(n, dtype=bool)
+        hit_mask = np.zeros(n, dtype=bool)
+        died_mask = np.zeros(n, dtype=bool)
+        live = np.flatnonzero(self.alive)
+        if not live.size:
+            return ate_mask, hit_mask, died_mask
+
+        actions = np.asarray(actions, dtype=np.int8)[live]
+        direction = self.direction[live]
+        turn = (actions >= 0) & (actions != OPPOSITE[direction])
+        direction = np.where(turn, actions, direction)
+        self.direction[live] = direction
+        self.ticks[live] += 1
+
+        x = self.x[live] + DELTA_X[direction]
+        y = self.y[live] + DELTA_Y[direction]
+        self.x[live], self.y[live] = x, y
+        out_of_bounds = (x < 0) | (x >= self.columns) | (y < 0) | (y >= self.rows)
+
+        # Las cabezas fuera del tablero terminan la partida y no entran en el cuerpo ni en la rejilla
+        games = live[~out_of_bounds]
+        cells = (y * self.columns + x)[~out_of_bounds]
+        head_index = (self.head_index[games] - 1) % self.capacity
+        self.head_index[games] = head_index
+        self.body[games, head_index] = cells
+        self.occupancy[games, cells] += 1
+
+        ate = self.fruit[games] == cells
+        eaters = games[ate]
+        self.scores[eaters] += 10
+        self.length[eaters] += 1
+        ate_mask[eaters] = True
+        movers = games[~ate]
+        tails = self.body[movers, (self.head_index[movers] + self.length[movers]) % self.capacity]
+        self.occupancy[movers, tails] -= 1
+        self.fruit[eaters] = self._spawn(eaters)
+
+        respawn = games[self.power_up_spawn[games]]
+        self.power_up[respawn] = self._spawn(respawn)
+        self.power_up_spawn[respawn] = False
+
+        picked = self.power_up[games] == cells
+        pickers = games[picked]
+        self.power_up_active[pickers] = True
+        self.power_up_spawn[pickers] = True
+        self.obstacles_hidden[pickers] = True
+        # Igual que `GameState`: el efecto termina en el tick siguiente a `power_up_ticks` ticks completos
+        self.power_up_end[pickers] = self.ticks[pickers] + self.power_up_ticks + 1
+        expired = live[self.obstacles_hidden[live] & (self.ticks[live] >= self.power_up_end[live])]
+        self.power_up_active[expired] = False
+        self.obstacles_hidden[expired] = False
+
+        # Los enemigos se mueven después del jugador: la cabeza choca con los que terminan en su celda
+        self._move_enemies(live)
+
+        # Pierdo todas las vidas si se colisiona contra algun limite de la ventana
+        walls = live[out_of_bounds]
+        hit_mask[walls] = True
+        self._end(walls, 'wall', died_mask)
+
+        hits = self.obstacles[games, cells] & ~self.obstacles_hidden[games]
+        self.lives[games] -= hits
+        hit_mask[games[hits]] = True
+        self._end(games[hits & (self.lives[games] <= 0)], 'obstacle', died_mask)
+
+        still = self.alive[games]
+        games, cells = games[still], cells[still]
+        extra = self.occupancy[games, cells].astype(np.int64) - 1
+        self.lives[games] = np.maximum(self.lives[games] - extra, 0)
+        hit_mask[games[extra > 0]] = True
+        self._end(games[(extra > 0) & (self.lives[games] == 0)], 'self', died_mask)
+
+        # Una vida por cada enemigo en la celda de la cabeza
+        still = self.alive[games]
+        games, cells = games[still], cells[still]
+        enemy_cells = self.enemy_y[games] * self.columns + self.enemy_x[games]
+        enemy_hits = (enemy_cells == cells[:, None]).sum(axis=1)
+        self.lives[games] = np.maximum(self.lives[games] - enemy_hits, 0)
+        hit_mask[games[enemy_hits > 0]] = True
+        self._end(games[(enemy_hits > 0) & (self.lives[games] == 0)], 'enemy', died_mask)
+        return ate_mask, hit_mask, died_mask
+
+    def body_cells(self, game):
+        """
+        Devuelve las celdas del cuerpo de una partida, empezando por la cabeza.
+        """
+        positions = (self.head_index[game] + np.arange(self.length[game])) % self.capacity
+        return self.body[game, positions]
+
+    def enemy_cells(self, game):
+        """
+        Devuelve las celdas de los enemigos de una partida.
+        """
+        return self.enemy_y[game] * self.columns + self.enemy_x[game]
+
+    def _move_enemies(self, games):
+        # El enemigo que saldría del tablero invierte su dirección y avanza hacia el otro lado
+        x, y = self.enemy_x[games], self.enemy_y[games]
+        dx, dy = self.enemy_dx[games], self.enemy_dy[games]
+        dx = np.where((x + dx < 0) | (x + dx >= self.columns), -dx, dx)
+        dy = np.where((y + dy < 0) | (y + dy >= self.rows), -dy, dy)
+        self.enemy_x[games], self.enemy_y[games] = x + dx, y + dy
+        self.enemy_dx[games], self.enemy_dy[games] = dx, dy
+
+    def _indices(self, games):
+        if games is None:
+            return np.arange(self.num_games)
+        games = np.asarray(games)
+        if games.dtype == bool:
+            return np.flatnonzero(games)
+        return games.astype(np.intp).ravel()
+
+    def _is_free(self, games, cells):
+        return ((self.occupancy[games, cells] == 0) & ~self.obstacles[games, cells]
+                & (self.fruit[games] != cells) & (self.power_up[games] != cells))
+
+    def _spawn(self, games):
+        """
+        Elige una celda libre para cada partida indicada.
+
+        Primero se prueban celdas al azar en bloque; las partidas que no encuentran lugar (tableros casi
+        llenos) eligen entre sus celdas libres una por una, así que el resultado siempre es válido.
+
+        Returns:
+            numpy.ndarray: Una celda por partida, o -1 si la partida no tiene celdas libres.
+        """
+        result = np.full(games.size, -1, dtype=np.intp)
+        pending = np.arange(games.size)
+        for _ in range(8):
+            if not pending.size:
+                return result
+            candidates = self.spawn_cells[self.rng.integers(0, self.spawn_cells.size, pending.size)]
+            free = self._is_free(games[pending], candidates)
+            result[pending[free]] = candidates[free]
+            pending = pending[~free]
+        for i in pending:
+            game = games[i]
+            free_cells = self.spawn_cells[self._is_free(np.full(self.spawn_cells.size, game), self.spawn_cells)]
+            if free_cells.size:
+                result[i] = self.rng.choice(free_cells)
+        return result
+
+    def _end(self, games, cause, died_mask):
+        self.alive[games] = False
+        self.death_cause[games] = DEATH_CAUSES.index(cause)
+        died_mask[games] = True
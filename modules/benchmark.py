@@ -0,0 +1,352 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+
+# Los bancos de dibujo corren sin ventana real y el resultado se imprime como JSON
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame
+from modules import settings, display, engine, scores, utils, autopilot, snapshot
+from modules.grid import CELL_SIZE
+from modules.renderer import Renderer
+from modules.assets import Assets
+
+def timed(function, repeat=3):
+    """
+    Ejecuta la función `repeat` veces y devuelve el menor tiempo en segundos.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def check_running(state):
+    """
+    Lanza RuntimeError si la partida terminó: los ticks posteriores no simulan nada y falsearían la medición.
+    """
+    if state.game_over:
+        raise RuntimeError(f'La partida del banco terminó en el tick {state.tick} ({state.death_cause})')
+
+def board_config(config, columns, rows, num_obstacles=0, num_enemies=0):
+    """
+    Devuelve una copia de la configuración para un tablero de `columns` x `rows` celdas.
+    """
+    return dict(config, window_x=columns * CELL_SIZE, window_y=rows * CELL_SIZE,
+                num_obstacles=num_obstacles, num_enemies=num_enemies, initial_lives=10 ** 9)
+
+def long_snake(config, length, seed=0):
+    """
+    Crea una partida cuyo jugador ya mide `length` segmentos, en zigzag sobre la parte superior de un
+    tablero de 1000 columnas, con la cabeza en la primera fila libre avanzando hacia la derecha.
+    """
+    columns = 1000
+    body_rows = length // columns + 1
+    state = engine.GameState(board_config(config, columns, body_rows + 10), seed)
+    grid = state.grid
+    for cell in state.player_body:
+        grid.remove_body(cell)
+        state.free_cells.add(cell)
+    state.player_body.clear()
+
+    # Zigzag de cola a cabeza: la cabeza queda en la columna 0 de la última fila del cuerpo
+    cells = []
+    for row in range(body_rows):
+        line = range(row * columns, (row + 1) * columns)
+        cells.extend(reversed(line) if (body_rows - row) % 2 else line)
+    for cell in cells[-length:]:
+        state.player_body.appendleft(cell)
+        grid.add_body(cell)
+        state.free_cells.discard(cell)
+    state.player_position = grid.position(state.player_body[0])
+    state.player_position = (state.player_position[0], state.player_position[1] + CELL_SIZE)
+    state.player_body.appendleft(grid.cell(state.player_position))
+    grid.add_body(state.player_body[0])
+    state.free_cells.discard(state.player_body[0])
+    state.direction = 'RIGHT'
+    # La fruta se generó antes que el cuerpo: si quedó debajo se genera otra en una celda libre
+    if grid.body[grid.cell(state.fruit_position)]:
+        state.fruit_position = state._spawn()
+    return state
+
+def bench_simulation(config, lengths, ticks=500):
+    """
+    Ticks por segundo de `GameState.step` según la longitud del jugador, y con los obstáculos y los
+    enemigos de cada dificultad en el tablero por defecto.
+    """
+    results = []
+    for length in lengths:
+        state = long_snake(config, length)
+        state.step('DOWN')
+        elapsed = timed(lambda: [state.step('RIGHT') for _ in range(ticks)], repeat=1)
+        check_running(state)
+        results.append({'length': len(state.player_body), 'ticks_per_second': ticks / elapsed})
+    for name, difficulty in config['difficulties'].items():
+        board = board_config(config, 72, 48, difficulty['num_obstacles'], difficulty['num_enemies'])
+        state = engine.GameState(board, 0)
+        moves = ['RIGHT'] * 16 + ['DOWN'] * 16 + ['LEFT'] * 16 + ['UP'] * 16
+        elapsed = timed(lambda: [state.step(moves[i % len(moves)]) for i in range(ticks)], repeat=1)
+        check_running(state)
+        results.append({'difficulty': name, 'ticks_per_second': ticks / elapsed})
+    return results
+
+def bench_autopilot(config, lengths, ticks=2000):
+    """
+    Ticks por segundo de una partida jugada por `autopilot.Autopilot`, búsquedas incluidas, según la longitud del jugador.
+    """
+    results = []
+    for length in lengths:
+        state = long_snake(config, length)
+        pilot = autopilot.Autopilot()
+        elapsed = timed(lambda: [state.step(pilot.choose(state)) for _ in range(ticks)], repeat=1)
+        check_running(state)
+        results.append({
+            'length': len(state.player_body),
+            'ticks_per_second': ticks / elapsed,
+            'plans': pilot.plans,
+            'score': state.score,
+        })
+    return results
+
+def bench_snapshot(config, lengths, repeat=20):
+    """
+    Tamaño y milisegundos de guardar y restaurar una instantánea según la longitud del jugador.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'snapshot.snk')
+        for length in lengths:
+            state = long_snake(config, length)
+            data = snapshot.dumps(state)
+            snapshot.save(state, filename)
+            results.append({
+                'length': len(state.player_body),
+                'bytes': len(data),
+                'dumps_ms': timed(lambda: [snapshot.dumps(state) for _ in range(repeat)]) / repeat * 1000,
+                'loads_ms': timed(lambda: [snapshot.loads(data) for _ in range(repeat)]) / repeat * 1000,
+                'load_file_ms': timed(lambda: [snapshot.load(filename) for _ in range(repeat)]) / repeat * 1000,
+            })
+    return results
+
+def bench_obstacles(config, counts, ticks=2000):
+    """
+    Costo de crear obstáculos y ticks por segundo según el número de obstáculos.
+    """
+    results = []
+    for count in counts:
+        side = max(int((count * 2) ** 0.5) + 2, 48)
+        board = board_config(config, side * 3 // 2, side, count)
+        created = timed(lambda: engine.GameState(board, 0), repeat=1)
+        state = engine.GameState(board, 0)
+        # Recorre un cuadrado para quedarse dentro del tablero
+        side = side // 2
+        moves = ['RIGHT'] * side + ['DOWN'] * side + ['LEFT'] * side + ['UP'] * side
+        elapsed = timed(lambda: [state.step(moves[i % len(moves)]) for i in range(ticks)], repeat=1)
+        check_running(state)
+        results.append({
+            'obstacles': len(state.static_obstacles),
+            'create_seconds': created,
+            'ticks_per_second': ticks / elapsed,
+        })
+    return results
+
+def bench_enemies(config, counts, ticks=500):
+    """
+    Ticks por segundo de `GameState.step` y milisegundos por cuadro del dibujo según el número de enemigos.
+    """
+    results = []
+    window = pygame.display.set_mode((720, 480))
+    image = pygame.image.load(config['background_image']).convert()
+    for count in counts:
+        state = engine.GameState(board_config(config, 72, 48, num_enemies=count), 0)
+        moves = ['RIGHT'] * 16 + ['DOWN'] * 16 + ['LEFT'] * 16 + ['UP'] * 16
+        elapsed = timed(lambda: [state.step(moves[i % len(moves)]) for i in range(ticks)], repeat=1)
+        check_running(state)
+        renderer = Renderer(window, image, config['player_color'])
+        renderer.draw(state)
+        frames = ticks // 5
+        drawing = timed(lambda: [(state.step(moves[i % len(moves)]), renderer.draw(state)) for i in range(frames)], repeat=1)
+        results.append({
+            'enemies': count,
+            'numpy': state.enemies.vectorized,
+            'ticks_per_second': ticks / elapsed,
+            'step_and_draw_ms': drawing / frames * 1000,
+        })
+    return results
+
+def bench_rendering(config, sizes, frames=200):
+    """
+    Milisegundos por cuadro del dibujo de la partida (cuadro completo e incremental) según el tamaño de ventana.
+    """
+    results = []
+    background = pygame.image.load(config['background_image'])
+    for width, height in sizes:
+        window = pygame.display.set_mode((width, height))
+        image = pygame.transform.scale(background, (width, height)).convert()
+        state = engine.GameState(board_config(config, width // CELL_SIZE, height // CELL_SIZE, 200), 0)
+        renderer = Renderer(window, image, config['player_color'])
+        renderer.draw(state)
+        full = timed(lambda: [renderer.draw_full(state) for _ in range(frames)])
+        side = min(width, height) // CELL_SIZE // 3
+        moves = ['RIGHT'] * side + ['DOWN'] * side + ['LEFT'] * side + ['UP'] * side
+        incremental = timed(lambda: [(state.step(moves[i % len(moves)]), renderer.draw(state)) for i in range(frames)], repeat=1)
+        check_running(state)
+        update = timed(lambda: [pygame.display.update() for _ in range(frames)])
+        results.append({
+            'window': [width, height],
+            'full_frame_ms': full / frames * 1000,
+            'incremental_frame_ms': incremental / frames * 1000,
+            'display_update_ms': update / frames * 1000,
+        })
+    return results
+
+def bench_large_board(config, boards, frames=200):
+    """
+    Milisegundos por cuadro del dibujo con la cámara siguiendo a la cabeza, en una ventana de 720x480,
+    según el tamaño del tablero. Un obstáculo cada 20 celdas.
+    """
+    results = []
+    window = pygame.display.set_mode((720, 480))
+    image = pygame.image.load(config['background_image']).convert()
+    for columns, rows in boards:
+        board = dict(board_config(config, 72, 48, columns * rows // 20),
+                     board_x=columns * CELL_SIZE, board_y=rows * CELL_SIZE)
+        state = engine.GameState(board, 0)
+        renderer = Renderer(window, image, config['player_color'])
+        renderer.draw(state)
+        side = min(columns, rows) // 3
+        moves = ['RIGHT'] * side + ['DOWN'] * side + ['LEFT'] * side + ['UP'] * side
+        drawing = timed(lambda: [(state.step(moves[i % len(moves)]), renderer.draw(state)) for i in range(frames)], repeat=1)
+        check_running(state)
+        results.append({
+            'board': [columns, rows],
+            'step_and_draw_ms': drawing / frames * 1000,
+        })
+    return results
+
+def bench_text(iterations=2000):
+    """
+    Microsegundos por llamada del texto del marcador, sin caché y con las cachés de `display`.
+    """
+    font = pygame.font.SysFont('times new roman', 20)
+    window = pygame.display.get_surface() or pygame.display.set_mode((720, 480))
+    uncached = timed(lambda: [pygame.font.SysFont('times new roman', 20).render('Score : 10', True, (255, 255, 255)) for _ in range(iterations // 10)])
+    render_only = timed(lambda: [font.render('Score : 10', True, (255, 255, 255)) for _ in range(iterations)])
+    cached = timed(lambda: [display.render_text('Score : 10', (255, 255, 255), 'times new roman', 20) for _ in range(iterations)])
+    show_score = timed(lambda: [display.show_score(window, 10, (255, 255, 255), 'times new roman', 20) for _ in range(iterations)])
+    return {
+        'sysfont_and_render_us': uncached / (iterations // 10) * 1e6,
+        'render_us': render_only / iterations * 1e6,
+        'cached_render_text_us': cached / iterations * 1e6,
+        'show_score_us': show_score / iterations * 1e6,
+    }
+
+def bench_assets(config):
+    """
+    Milisegundos para cargar las imágenes de fondo: decodificando el archivo original (caché vacío) y
+    leyendo el caché en disco de `assets.Assets`.
+    """
+    results = []
+    pygame.display.get_surface() or pygame.display.set_mode((720, 480))
+    with tempfile.TemporaryDirectory() as directory:
+        for path in (config['background_menu'], config['background_image']):
+            cold = timed(lambda: Assets(directory).image(path), repeat=1)
+            warm = timed(lambda: Assets(directory).image(path))
+            results.append({'image': path, 'cold_ms': cold * 1000, 'cached_ms': warm * 1000})
+    return results
+
+def bench_scores(row_counts, writes=1000):
+    """
+    Filas por segundo de `display.load_scores`, carga del índice de `scores.ScoreStore`, escrituras por
+    segundo de `utils.save_score` y consultas por página según el tamaño de 'scores.csv'.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in row_counts:
+            filename = os.path.join(directory, f'scores_{rows}.csv')
+            with open(filename, 'w') as file:
+                file.writelines(f'{settings.player_names[i % len(settings.player_names)]},{i % 997}\n' for i in range(rows))
+            load = timed(lambda: display.load_scores(filename))
+            store_load = timed(lambda: scores.ScoreStore(filename).load())
+            store = scores.get_store(filename)
+            # El índice se carga antes de medir: las escrituras no deben incluir la lectura del archivo
+            store.load()
+            save = timed(lambda: ([utils.save_score('Alice', 10, filename) for _ in range(writes)], store.flush()), repeat=1)
+            page = timed(lambda: [store.page(2, 6) for _ in range(writes)])
+            # El archivo se borra con la carpeta temporal: el hilo de escritura no debe sobrevivirla
+            store.close()
+            results.append({
+                'rows': rows,
+                'load_seconds': load,
+                'load_rows_per_second': rows / load,
+                'store_load_seconds': store_load,
+                'save_per_second': writes / save,
+                'page_query_us': page / writes * 1e6,
+            })
+    return results
+
+def run(quick=False):
+    """
+    Ejecuta todos los bancos de medición.
+
+    Args:
+        quick (bool, optional): Usar tamaños reducidos para una corrida rápida. Por defecto False.
+
+    Returns:
+        dict: Los resultados de cada banco y los datos del entorno.
+    """
+    config = settings.load_settings()
+    difficulty_obstacles = sorted({level['num_obstacles'] for level in config['difficulties'].values()})
+    if quick:
+        lengths, obstacles = [10, 1000, 10000], difficulty_obstacles + [1000]
+        sizes, score_rows = [(720, 480)], [1000, 10000]
+        enemy_counts = [20, 1000]
+        boards = [(72, 48), (300, 300)]
+    else:
+        lengths, obstacles = [10, 100, 1000, 10000, 100000], difficulty_obstacles + [1000, 10000, 100000]
+        sizes, score_rows = [(720, 480), (1280, 720), (1920, 1080)], [1000, 10000, 100000, 1000000]
+        enemy_counts = [20, 1000, 5000, 20000]
+        boards = [(72, 48), (300, 300), (1000, 1000)]
+
+    pygame.init()
+    results = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'simulation': bench_simulation(config, lengths),
+        'autopilot': bench_autopilot(config, lengths),
+        'snapshot': bench_snapshot(config, lengths),
+        'obstacles': bench_obstacles(config, obstacles),
+        'enemies': bench_enemies(config, enemy_counts),
+        'rendering': bench_rendering(config, sizes),
+        'large_board': bench_large_board(config, boards),
+        'text': bench_text(),
+        'assets': bench_assets(config),
+        'scores': bench_scores(score_rows),
+    }
+    pygame.quit()
+    return results
+
+def main():
+    """
+    Punto de entrada de línea de comandos: `python -m modules.benchmark [--quick] [--output resultados.json]`.
+    """
+    parser = argparse.ArgumentParser(description='Mide el rendimiento de la simulación, el dibujo y las puntuaciones.')
+    parser.add_argument('--quick', action='store_true', help='tamaños reducidos')
+    parser.add_argument('--output', help='archivo JSON donde guardar los resultados (por defecto la salida estándar)')
+    args = parser.parse_args()
+
+    output = json.dumps(run(args.quick), indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
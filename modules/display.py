@@ -1,5 +1,43 @@
+import functools
 import pygame
-from modules import settings
+from modules import settings, scores
+
+# Fuentes ya creadas, por (nombre, tamaño): pygame.font.SysFont busca la fuente en el sistema en cada llamada
+_fonts = {}
+
+def get_font(name, size):
+    """
+    Devuelve la fuente del sistema con el nombre y el tamaño dados, creándola solo la primera vez.
+
+    Args:
+        name (str): El nombre de la fuente.
+        size (int): El tamaño de la fuente.
+
+    Returns:
+        pygame.font.Font: La fuente solicitada.
+    """
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+@functools.lru_cache(maxsize=256)
+def render_text(text, color, font, size):
+    """
+    Renderiza un texto con antialiasing y guarda la superficie para reutilizarla.
+
+    Las superficies devueltas se comparten entre llamadas, así que solo deben usarse para hacer blit.
+
+    Args:
+        text (str): El texto a renderizar.
+        color (tuple): El color RGB del texto.
+        font (str): El nombre de la fuente.
+        size (int): El tamaño de la fuente.
+
+    Returns:
+        pygame.Surface: La superficie con el texto renderizado.
+    """
+    return get_font(font, size).render(text, True, color)
 
 def show_score(window, score, color, font, size):
     """
@@ -13,12 +51,12 @@ def show_score(window, score, color, font, size):
         size (int): El tamaño de la fuente que se utilizará para el texto de la partitura.
 
     Returns:
-        None
+        pygame.Rect: El área de la ventana ocupada por el texto.
     """
-    score_font = pygame.font.SysFont(font, size)
-    score_surface = score_font.render('Score : ' + str(score), True, color)
+    score_surface = render_text('Score : ' + str(score), tuple(color), font, size)
     score_rect = score_surface.get_rect()
     window.blit(score_surface, score_rect)
+    return score_rect
 
 def show_lives(window, lives, color, font, size, window_x):
     """
@@ -33,69 +71,38 @@ def show_lives(window, lives, color, font, size, window_x):
         window_x: La coordenada x de la ventana.
 
     Returns:
-        None
+        pygame.Rect: El área de la ventana ocupada por el texto.
     """
-    lives_font = pygame.font.SysFont(font, size)
-    lives_surface = lives_font.render('Lives : ' + str(lives), True, color)
+    lives_surface = render_text('Lives : ' + str(lives), tuple(color), font, size)
     lives_rect = lives_surface.get_rect(topleft=(window_x - 150, 0))
     window.blit(lives_surface, lives_rect)
+    return lives_rect
+
+# Botones de cada pantalla del menú, de arriba hacia abajo
+MENU_BUTTONS = {
+    'start': ('Play', 'Options', 'Scores', 'Quit'),
+    'options': ('Easy', 'Medium', 'Hard', 'Back'),
+    'scores': ('Back',),
+}
 
 def start_screen(window, window_x, window_y, background_image_menu):
     """
-    Muestra continuamente la pantalla de inicio con diferentes botones en la ventana.
-    
+    Muestra el menú a partir de la pantalla de inicio hasta que el jugador elija jugar.
+
     Args:
         window: La superficie sobre la que se dibujará la pantalla de inicio.
         window_x: La anchura de la ventana.
         window_y: La altura de la ventana.
         background_image_menu: La imagen de fondo del menú.
-    
+
     Returns:
         None
     """
-    while True:
-        window.fill((0, 0, 0))
-        window.blit(background_image_menu, [0, 0])
-        title_font = pygame.font.SysFont('times new roman', 50)
-        button_font = pygame.font.SysFont('times new roman', 35)
-
-        play_button_surface = button_font.render('Play', True, (255, 255, 255))
-        play_button_rect = play_button_surface.get_rect(center=(window_x/2, window_y/2))
-        window.blit(play_button_surface, play_button_rect)
-
-        options_button_surface = button_font.render('Options', True, (255, 255, 255))
-        options_button_rect = options_button_surface.get_rect(center=(window_x/2, window_y/2 + 50))
-        window.blit(options_button_surface, options_button_rect)
-
-        scores_button_surface = button_font.render('Scores', True, (255, 255, 255))
-        scores_button_rect = scores_button_surface.get_rect(center=(window_x/2, window_y/2 + 100))
-        window.blit(scores_button_surface, scores_button_rect)
-
-        quit_button_surface = button_font.render('Quit', True, (255, 255, 255))
-        quit_button_rect = quit_button_surface.get_rect(center=(window_x/2, window_y/2 + 150))
-        window.blit(quit_button_surface, quit_button_rect)
-
-        pygame.display.update()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                if play_button_rect.collidepoint(mouse_pos):
-                    return
-                elif options_button_rect.collidepoint(mouse_pos):
-                    return options_screen(window, window_x, window_y, background_image_menu)
-                elif scores_button_rect.collidepoint(mouse_pos):
-                    return scores_screen(window, window_x, window_y, background_image_menu)
-                elif quit_button_rect.collidepoint(mouse_pos):
-                    pygame.quit()
-                    quit()
+    run_menu(window, window_x, window_y, background_image_menu, 'start')
 
 def options_screen(window, window_x, window_y, background_image_menu):
     """
-    Muestra continuamente la pantalla de opciones con diferentes botones en la ventana.
+    Muestra el menú a partir de la pantalla de opciones hasta que el jugador elija jugar.
 
     Args:
         window (pygame.Surface): La superficie sobre la que se dibujará la pantalla de opciones.
@@ -106,51 +113,116 @@ def options_screen(window, window_x, window_y, background_image_menu):
     Returns:
         None
     """
-    while True:
-        window.fill((0, 0, 0))
-        options_font = pygame.font.SysFont('times new roman', 50)
-        button_font = pygame.font.SysFont('times new roman', 35)
-
-        options_surface = options_font.render('Options', True, (0, 255, 0))
-        options_rect = options_surface.get_rect(center=(window_x/2, window_y/4))
-        window.blit(options_surface, options_rect)
-
-        easy_button_surface = button_font.render('Easy', True, (255, 255, 255))
-        easy_button_rect = easy_button_surface.get_rect(center=(window_x/2, window_y/2))
-        window.blit(easy_button_surface, easy_button_rect)
+    run_menu(window, window_x, window_y, background_image_menu, 'options')
 
-        medium_button_surface = button_font.render('Medium', True, (255, 255, 255))
-        medium_button_rect = medium_button_surface.get_rect(center=(window_x/2, window_y/2 + 50))
-        window.blit(medium_button_surface, medium_button_rect)
+def run_menu(window, window_x, window_y, background_image_menu, screen='start'):
+    """
+    Máquina de estados del menú: inicio, opciones y puntuaciones.
 
-        hard_button_surface = button_font.render('Hard', True, (255, 255, 255))
-        hard_button_rect = hard_button_surface.get_rect(center=(window_x/2, window_y/2 + 100))
-        window.blit(hard_button_surface, hard_button_rect)
+    El bucle se bloquea en `pygame.event.wait()` hasta que llega un evento, así que con el menú quieto
+    no consume CPU, y la pantalla se redibuja solo cuando cambia (al navegar, al cambiar de página de
+    puntuaciones o cuando el sistema pide volver a pintar la ventana). Navegar entre pantallas cambia
+    el estado en lugar de llamar a otra función, así que la pila no crece.
 
-        back_button_surface = button_font.render('Back', True, (255, 255, 255))
-        back_button_rect = back_button_surface.get_rect(center=(window_x/2, window_y/2 + 150))
-        window.blit(back_button_surface, back_button_rect)
+    El menú termina al pulsar Play o al elegir una dificultad, que además la aplica a los ajustes.
+    Quit o cerrar la ventana terminan el proceso.
 
-        pygame.display.update()
+    Args:
+        window (pygame.Surface): La superficie sobre la que se dibuja el menú.
+        window_x (int): La anchura de la ventana.
+        window_y (int): La altura de la ventana.
+        background_image_menu (pygame.Surface): La imagen de fondo del menú.
+        screen (str, optional): La pantalla inicial: 'start', 'options' o 'scores'. Por defecto 'start'.
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+    Returns:
+        None
+    """
+    store = scores.get_store()
+    rows_per_page = max(1, int((window_y - 90 - (window_y/4 + 50)) // 40) + 1)
+    page = 0
+    redraw = True
+    while True:
+        if redraw:
+            if screen == 'start':
+                buttons = draw_start_screen(window, window_x, window_y, background_image_menu)
+            elif screen == 'options':
+                buttons = draw_options_screen(window, window_x, window_y)
+            else:
+                buttons = draw_scores_screen(window, window_x, window_y, background_image_menu, store.page(page, rows_per_page))
+            pygame.display.update()
+            redraw = False
+
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            quit()
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            redraw = True
+        # Los botones 4 y 5 son la rueda del ratón, que en las puntuaciones cambia de página
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button <= 3:
+            clicked = next((label for label, rect in buttons.items() if rect.collidepoint(event.pos)), None)
+            if clicked == 'Play':
+                return
+            elif clicked == 'Quit':
                 pygame.quit()
                 quit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                if easy_button_rect.collidepoint(mouse_pos):
-                    update_game_settings('easy')
-                    return
-                elif medium_button_rect.collidepoint(mouse_pos):
-                    update_game_settings('medium')
-                    return
-                elif hard_button_rect.collidepoint(mouse_pos):
-                    update_game_settings('hard')
-                    return
-                elif back_button_rect.collidepoint(mouse_pos):
-                    start_screen(window, window_x, window_y, background_image_menu)
-                    return
+            elif clicked in ('Easy', 'Medium', 'Hard'):
+                update_game_settings(clicked.lower())
+                return
+            elif clicked in ('Options', 'Scores', 'Back'):
+                screen = {'Options': 'options', 'Scores': 'scores', 'Back': 'start'}[clicked]
+                page = 0
+                redraw = True
+        elif screen == 'scores':
+            last_page = store.pages(rows_per_page) - 1
+            previous_page = page
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_DOWN, pygame.K_RIGHT):
+                page = min(page + 1, last_page)
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_UP, pygame.K_LEFT):
+                page = max(page - 1, 0)
+            elif event.type == pygame.MOUSEWHEEL:
+                page = min(max(page - event.y, 0), last_page)
+            redraw = page != previous_page
+
+def draw_buttons(window, labels, x, top, spacing=50):
+    """
+    Dibuja una columna de botones de texto centrados en `x`, empezando en `top`.
+
+    Returns:
+        dict: El rectángulo de cada botón, por su texto.
+    """
+    buttons = {}
+    for index, label in enumerate(labels):
+        surface = render_text(label, (255, 255, 255), 'times new roman', 35)
+        buttons[label] = surface.get_rect(center=(x, top + index * spacing))
+        window.blit(surface, buttons[label])
+    return buttons
+
+def draw_title(window, title, window_x, window_y):
+    title_surface = render_text(title, (0, 255, 0), 'times new roman', 50)
+    window.blit(title_surface, title_surface.get_rect(center=(window_x/2, window_y/4)))
+
+def draw_start_screen(window, window_x, window_y, background_image_menu):
+    """
+    Dibuja la pantalla de inicio.
+
+    Returns:
+        dict: El rectángulo de cada botón, por su texto.
+    """
+    window.fill((0, 0, 0))
+    window.blit(background_image_menu, [0, 0])
+    return draw_buttons(window, MENU_BUTTONS['start'], window_x/2, window_y/2)
+
+def draw_options_screen(window, window_x, window_y):
+    """
+    Dibuja la pantalla de opciones.
+
+    Returns:
+        dict: El rectángulo de cada botón, por su texto.
+    """
+    window.fill((0, 0, 0))
+    draw_title(window, 'Options', window_x, window_y)
+    return draw_buttons(window, MENU_BUTTONS['options'], window_x/2, window_y/2)
 
 def update_game_settings(difficulty):
     """
@@ -195,7 +267,10 @@ def load_scores(filename='scores.csv'):
 
 def scores_screen(window, window_x, window_y, background_image_menu):
     """
-    Muestra la pantalla de resultados en un partido.
+    Muestra el menú a partir de la pantalla de puntuaciones hasta que el jugador elija jugar.
+
+    Las mejores puntuaciones se piden por páginas al almacén de `scores`, que lee el archivo una sola vez;
+    las flechas o la rueda del ratón cambian de página.
 
     Args:
         window (pygame.Surface): La superficie sobre la que se dibujará la pantalla de puntuaciones.
@@ -206,36 +281,27 @@ def scores_screen(window, window_x, window_y, background_image_menu):
     Returns:
         None
     """
-    while True:
-        window.fill((0, 0, 0))
-        window.blit(background_image_menu, [0, 0])
-        scores_font = pygame.font.SysFont('times new roman', 50)
-        button_font = pygame.font.SysFont('times new roman', 35)
-
-        scores_surface = scores_font.render('Scores', True, (0, 255, 0))
-        scores_rect = scores_surface.get_rect(center=(window_x/2, window_y/4))
-        window.blit(scores_surface, scores_rect)
-
-        scores = load_scores()
-        y_offset = window_y/4 + 50
-        for player_name, score in scores:
-            score_text = button_font.render(f'{player_name}: {score}', True, (255, 255, 255))
-            score_rect = score_text.get_rect(center=(window_x/2, y_offset))
-            window.blit(score_text, score_rect)
-            y_offset += 40
-
-        back_button_surface = button_font.render('Back', True, (255, 255, 255))
-        back_button_rect = back_button_surface.get_rect(center=(window_x/2, window_y - 50))
-        window.blit(back_button_surface, back_button_rect)
-
-        pygame.display.update()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                if back_button_rect.collidepoint(mouse_pos):
-                    start_screen(window, window_x, window_y, background_image_menu)
-                    return
+    run_menu(window, window_x, window_y, background_image_menu, 'scores')
+
+def draw_scores_screen(window, window_x, window_y, background_image_menu, rows):
+    """
+    Dibuja la pantalla de puntuaciones con una página de resultados.
+
+    Args:
+        rows (list): Las tuplas (nombre del jugador, puntuación) de la página.
+
+    Returns:
+        dict: El rectángulo de cada botón, por su texto.
+    """
+    window.fill((0, 0, 0))
+    window.blit(background_image_menu, [0, 0])
+    draw_title(window, 'Scores', window_x, window_y)
+
+    y_offset = window_y/4 + 50
+    for player_name, score in rows:
+        score_text = render_text(f'{player_name}: {score}', (255, 255, 255), 'times new roman', 35)
+        score_rect = score_text.get_rect(center=(window_x/2, y_offset))
+        window.blit(score_text, score_rect)
+        y_offset += 40
+
+    return draw_buttons(window, MENU_BUTTONS['scores'], window_x/2, window_y - 50)
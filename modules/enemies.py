@@ -0,0 +1,170 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # Sin NumPy los enemigos se mueven con un bucle sobre los mismos arreglos
+    np = None
+
+# Desplazamiento (columnas, filas) de cada dirección: 'UP', 'DOWN', 'LEFT' y 'RIGHT'
+DELTAS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+# Desde cuántos enemigos conviene NumPy: con menos, el costo fijo de cada operación vectorizada
+# supera al del bucle sobre los arreglos de `array`
+VECTORIZE_MIN = 64
+
+class Enemies:
+    """
+    Enemigos que avanzan una celda por tick en línea recta y rebotan en los bordes del tablero.
+
+    Se guardan como estructura de arreglos: la columna, la fila, el desplazamiento y la celda de cada
+    enemigo están en arreglos paralelos en lugar de un diccionario por enemigo. Desde `VECTORIZE_MIN`
+    enemigos `step()` los mueve a todos con operaciones vectorizadas de NumPy; con menos, o si NumPy no
+    está instalado, se usan arreglos de `array` y un bucle, con el mismo resultado.
+
+    Cuántos enemigos hay en cada celda se cuenta en la misma `grid.OccupancyGrid` que el cuerpo y los
+    obstáculos, así que saber si la cabeza choca con un enemigo cuesta O(1) sin importar cuántos haya.
+    """
+
+    def __init__(self, grid, count, free_cells, rng):
+        """
+        Crea los enemigos en celdas libres al azar, cada uno con una dirección al azar.
+
+        Las celdas no se reservan: los enemigos se mueven en cada tick y pueden pasar por encima de la
+        fruta y del power-up.
+
+        Args:
+            grid (OccupancyGrid): La rejilla del tablero, donde se cuentan los enemigos.
+            count (int): El número de enemigos.
+            free_cells (grid.FreeCells): Las celdas libres del tablero.
+            rng (random.Random): El generador de números aleatorios de la partida.
+        """
+        self.grid = grid
+        x, y, dx, dy = [], [], [], []
+        for _ in range(count if len(free_cells) else 0):
+            row, column = divmod(free_cells.cells[rng.randrange(len(free_cells))], grid.columns)
+            delta_x, delta_y = DELTAS[rng.randrange(len(DELTAS))]
+            x.append(column)
+            y.append(row)
+            dx.append(delta_x)
+            dy.append(delta_y)
+        self._assign(x, y, dx, dy)
+
+    @classmethod
+    def from_arrays(cls, grid, x, y, dx, dy):
+        """
+        Crea los enemigos en las columnas y filas dadas, con sus desplazamientos, por ejemplo al
+        restaurar una partida guardada con `snapshot`.
+
+        Args:
+            grid (OccupancyGrid): La rejilla del tablero, donde se cuentan los enemigos.
+            x, y (array): La columna y la fila de cada enemigo.
+            dx, dy (array): El desplazamiento por tick de cada enemigo: -1, 0 o 1.
+        """
+        enemies = cls.__new__(cls)
+        enemies.grid = grid
+        enemies._assign(x, y, dx, dy)
+        return enemies
+
+    def _assign(self, x, y, dx, dy):
+        self.vectorized = np is not None and len(x) >= VECTORIZE_MIN
+        if self.vectorized:
+            self.x, self.y = np.array(x, dtype=np.int32), np.array(y, dtype=np.int32)
+            self.dx, self.dy = np.array(dx, dtype=np.int32), np.array(dy, dtype=np.int32)
+            self.counts = np.frombuffer(self.grid.enemies, dtype=np.uint16)
+        else:
+            self.x, self.y = array('i', x), array('i', y)
+            self.dx, self.dy = array('i', dx), array('i', dy)
+        self.cells = self._cells(self.x, self.y)
+        for cell in self.cell_list():
+            self.grid.add_enemy(cell)
+
+    def __len__(self):
+        return len(self.x)
+
+    def cell_list(self):
+        """
+        Devuelve las celdas de los enemigos como una lista de enteros.
+        """
+        return self.cells.tolist()
+
+    def step(self, changed_cells=True):
+        """
+        Mueve todos los enemigos una celda y actualiza la rejilla.
+
+        Args:
+            changed_cells (bool, optional): Si hay que devolver las celdas cambiadas. Por defecto True.
+
+        Returns:
+            list: Las celdas que dejaron y las que ocupan ahora, para redibujarlas, o una lista vacía si
+                  `changed_cells` es False.
+        """
+        if not len(self):
+            return []
+        if not self.vectorized:
+            return self._step_loop(changed_cells)
+        old = self.cells
+        self.x, self.y, self.dx, self.dy = self._moved()
+        self.cells = self._cells(self.x, self.y)
+        # Se agrupan las celdas repetidas: la asignación con índices repetidos sumaría una sola vez
+        cells, counts = np.unique(old, return_counts=True)
+        self.counts[cells] -= counts.astype(np.uint16)
+        cells, counts = np.unique(self.cells, return_counts=True)
+        self.counts[cells] += counts.astype(np.uint16)
+        if not changed_cells:
+            return []
+        return old.tolist() + self.cells.tolist()
+
+    def _step_loop(self, changed_cells):
+        # Un solo recorrido que mueve cada enemigo en su lugar y actualiza su cuenta en la rejilla
+        columns, rows = self.grid.columns, self.grid.rows
+        x, y, dx, dy, cells = self.x, self.y, self.dx, self.dy, self.cells
+        counts = self.grid.enemies
+        changed = cells.tolist() if changed_cells else None
+        for i in range(len(cells)):
+            column, row, delta_x, delta_y = x[i], y[i], dx[i], dy[i]
+            if not 0 <= column + delta_x < columns:
+                delta_x = dx[i] = -delta_x
+            if not 0 <= row + delta_y < rows:
+                delta_y = dy[i] = -delta_y
+            column += delta_x
+            row += delta_y
+            x[i], y[i] = column, row
+            counts[cells[i]] -= 1
+            cell = cells[i] = column + row * columns
+            counts[cell] += 1
+            if changed_cells:
+                changed.append(cell)
+        return changed if changed_cells else []
+
+    def next_cells(self):
+        """
+        Devuelve las celdas que ocuparán los enemigos después del próximo `step()`, sin moverlos.
+        """
+        if self.vectorized:
+            x, y, _, _ = self._moved()
+            return self._cells(x, y).tolist()
+        columns, rows = self.grid.columns, self.grid.rows
+        cells = []
+        for column, row, delta_x, delta_y in zip(self.x, self.y, self.dx, self.dy):
+            if not 0 <= column + delta_x < columns:
+                delta_x = -delta_x
+            if not 0 <= row + delta_y < rows:
+                delta_y = -delta_y
+            cells.append(column + delta_x + (row + delta_y) * columns)
+        return cells
+
+    def _moved(self):
+        # El enemigo que saldría del tablero invierte su dirección y avanza hacia el otro lado; solo
+        # para el camino vectorizado, el bucle hace lo mismo en `_step_loop()` y `next_cells()`
+        columns, rows = self.grid.columns, self.grid.rows
+        next_x, next_y = self.x + self.dx, self.y + self.dy
+        dx = np.where((next_x < 0) | (next_x >= columns), -self.dx, self.dx)
+        dy = np.where((next_y < 0) | (next_y >= rows), -self.dy, self.dy)
+        return self.x + dx, self.y + dy, dx, dy
+
+    def _cells(self, x, y):
+        columns = self.grid.columns
+        if self.vectorized:
+            return x + y * columns
+        return array('i', [column + row * columns for column, row in zip(x, y)])
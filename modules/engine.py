@@ -0,0 +1,221 @@
+import random
+from collections import deque
+from modules import utils
+from modules.grid import OccupancyGrid, FreeCells
+from modules.timers import Scheduler
+from modules.enemies import Enemies
+
+class GameState:
+    """
+    Estado completo de una partida de Snake, independiente de la ventana, del mixer y del reloj.
+
+    Toda la lógica que antes vivía como variables globales dentro de `main.main()` se concentra aquí,
+    de modo que la simulación puede avanzar miles de ticks por segundo sin pygame.display ni time.sleep.
+    Los temporizadores se expresan en ticks: `power_up_duration` (segundos) se multiplica por
+    `player_speed` (ticks por segundo), que es la velocidad a la que corre el bucle interactivo.
+    Los vencimientos (fin del power-up, reaparición de los obstáculos) se programan en un
+    `timers.Scheduler`, así que no dependen del reloj del sistema.
+
+    Los elementos se generan con un `random.Random` propio sobre las celdas libres del tablero,
+    así que dos partidas con la misma semilla y las mismas entradas son idénticas.
+
+    Attributes:
+        board_x, board_y (int): El tamaño del tablero en píxeles, que puede ser mayor que la ventana.
+        player_position (tuple): La posición de la cabeza como (x, y).
+        player_body (deque): Los índices de celda del cuerpo en `grid`, empezando por la cabeza.
+        fruit_position (tuple): La posición de la fruta.
+        power_up_position (tuple): La posición del power-up.
+        static_obstacles (list): Las posiciones de los obstáculos estáticos.
+        enemies (enemies.Enemies): Los enemigos en movimiento.
+        direction (str): La dirección actual del jugador.
+        score (int): La puntuación actual.
+        lives (int): Las vidas restantes.
+        seed (int): La semilla del generador de números aleatorios de la partida.
+        tick (int): El número de ticks simulados.
+        game_over (bool): True cuando la partida terminó.
+        death_cause (str): 'wall', 'obstacle', 'self' o 'enemy' si la partida terminó, None en caso contrario.
+        track_dirty (bool): Si `step()` anota las celdas cambiadas en `dirty_cells`. Lo activa el `Renderer`
+            al dibujar la partida; sin ventana queda en False y la simulación no hace trabajo de dibujo.
+        dirty_cells (set): Las celdas cuyo contenido cambió desde la última llamada a `take_dirty_cells()`.
+    """
+
+    def __init__(self, config, seed=None):
+        """
+        Crea una partida nueva a partir de la configuración del juego.
+
+        Args:
+            config (dict): La configuración cargada desde 'settings.json'.
+            seed (int, optional): La semilla para generar los elementos. Por defecto None (no reproducible).
+        """
+        # Con 'board_x'/'board_y' en 0 el tablero mide lo mismo que la ventana
+        self.board_x = config['board_x'] or config['window_x']
+        self.board_y = config['board_y'] or config['window_y']
+        self.power_up_ticks = config['power_up_duration'] * config['player_speed']
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.player_position = (100, 50)
+        self.grid = OccupancyGrid(self.board_x, self.board_y)
+        self.player_body = deque([self.grid.cell(self.player_position)])
+        self.grid.add_body(self.player_body[0])
+        self.free_cells = FreeCells(self.grid)
+
+        self.static_obstacles = utils.create_obstacles(self.board_x, self.board_y, config['num_obstacles'], self.free_cells, self.rng)
+        for obstacle in self.static_obstacles:
+            self.grid.add_obstacle(self.grid.cell(obstacle))
+        self.obstacles_hidden = False
+
+        self.fruit_position = self._spawn()
+        self.power_up_position = self._spawn()
+        self.power_up_spawn = True
+        self.power_up_active = False
+        self.enemies = Enemies(self.grid, config['num_enemies'], self.free_cells, self.rng)
+
+        self.direction = 'RIGHT'
+        self.score, self.lives = 0, config['initial_lives']
+
+        self.tick = 0
+        self.timers = Scheduler()
+        self.game_over = False
+        self.death_cause = None
+        self.track_dirty = False
+        self.dirty_cells = set()
+
+    def step(self, change_to):
+        """
+        Avanza la partida un tick.
+
+        Args:
+            change_to (str): La dirección pedida por el jugador: 'UP', 'DOWN', 'LEFT' o 'RIGHT'.
+
+        Returns:
+            list: Los eventos ocurridos durante el tick, en orden. Pueden ser 'fruit' (se comió la fruta),
+                  'power_up_spawn' (apareció un power-up), 'power_up' (se recogió el power-up),
+                  'lose_life' (un golpe que reproduce el sonido de vida perdida) y 'game_over'.
+        """
+        events = []
+        if self.game_over:
+            return events
+        self.tick += 1
+
+        self.direction = utils.validate_direction(change_to, self.direction)
+        self.player_position = utils.move_player(self.player_position, self.direction)
+        # La cabeza fuera del tablero termina la partida y no entra en el cuerpo ni en la rejilla
+        out_of_bounds = utils.check_collision(self.player_position, self.board_x, self.board_y)
+
+        head = None
+        if not out_of_bounds:
+            head = self.grid.cell(self.player_position)
+            self.player_body.appendleft(head)
+            self.grid.add_body(head)
+            self.free_cells.discard(head)
+            if self.track_dirty:
+                self.dirty_cells.add(head)
+            if self.player_position == self.fruit_position:
+                self.score += 10
+                self.fruit_position = self._spawn()
+                self._mark_dirty(self.fruit_position)
+                events.append('fruit')
+            else:
+                tail = self.player_body.pop()
+                self.grid.remove_body(tail)
+                self._release(tail)
+                if self.track_dirty:
+                    self.dirty_cells.add(tail)
+
+        if self.power_up_spawn:
+            previous = self.power_up_position
+            self.power_up_position = self._spawn()
+            self.power_up_spawn = False
+            if previous is not None:
+                self._release(self.grid.cell(previous))
+            self._mark_dirty(previous)
+            self._mark_dirty(self.power_up_position)
+            events.append('power_up_spawn')
+
+        if self.player_position == self.power_up_position:
+            self.power_up_active = True
+            self.power_up_spawn = True
+            self.obstacles_hidden = True
+            # Ambos efectos duran `power_up_ticks` ticks completos y terminan en el tick siguiente
+            self.timers.schedule('power_up_end', self.tick + self.power_up_ticks + 1)
+            self.timers.schedule('obstacles_show', self.tick + self.power_up_ticks + 1)
+            events.append('power_up')
+
+        # Los enemigos se mueven después del jugador: la cabeza choca con los que terminan en su celda
+        self.dirty_cells.update(self.enemies.step(self.track_dirty))
+
+        for timer in self.timers.pop_due(self.tick):
+            if timer == 'power_up_end':
+                self.power_up_active = False
+            elif timer == 'obstacles_show':
+                self.obstacles_hidden = False
+
+        # Pierdo todas las vidas si se colisiona contra algun limite de la ventana
+        if out_of_bounds:
+            events.append('lose_life')
+            self._end(events, 'wall')
+            return events
+
+        # Una vida por cada obstáculo y por cada otro segmento del cuerpo en la celda de la cabeza
+        if not self.obstacles_hidden:
+            for _ in range(self.grid.obstacle_count(head)):
+                if self._lose_life(events, 'obstacle'):
+                    return events
+
+        for _ in range(self.grid.body_count(head) - 1):
+            if self._lose_life(events, 'self'):
+                return events
+
+        for _ in range(self.grid.enemy_count(head)):
+            if self._lose_life(events, 'enemy'):
+                return events
+
+        return events
+
+    def take_dirty_cells(self):
+        """
+        Devuelve las celdas que cambiaron desde la llamada anterior y empieza un conjunto nuevo.
+
+        Returns:
+            set: Los índices de celda a redibujar.
+        """
+        dirty_cells, self.dirty_cells = self.dirty_cells, set()
+        return dirty_cells
+
+    def _mark_dirty(self, position):
+        if self.track_dirty and position is not None:
+            self.dirty_cells.add(self.grid.cell(position))
+
+    def _spawn(self):
+        return utils.spawn_item(self.board_x, self.board_y, self.free_cells, self.rng)
+
+    def _release(self, cell):
+        """
+        Devuelve la celda al conjunto de celdas libres si ya nada la ocupa.
+        """
+        if self.grid.body[cell] or self.grid.obstacles[cell]:
+            return
+        for item in (self.fruit_position, self.power_up_position):
+            if item is not None and self.grid.cell(item) == cell:
+                return
+        self.free_cells.add(cell)
+
+    def _lose_life(self, events, cause):
+        """
+        Descuenta una vida y termina la partida si no quedan más.
+
+        Returns:
+            bool: True si la partida terminó.
+        """
+        self.lives -= 1
+        events.append('lose_life')
+        if self.lives == 0:
+            self._end(events, cause)
+            return True
+        return False
+
+    def _end(self, events, cause):
+        self.game_over = True
+        self.death_cause = cause
+        events.append('game_over')
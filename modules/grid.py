@@ -0,0 +1,170 @@
+from array import array
+
+CELL_SIZE = 10
+
+class OccupancyGrid:
+    """
+    Rejilla de ocupación indexada por celda para las colisiones del jugador.
+
+    El tablero se divide en celdas de `CELL_SIZE` píxeles, las mismas que usa `utils.spawn_item`.
+    Cada celda guarda cuántos segmentos del cuerpo, cuántos obstáculos y cuántos enemigos la ocupan, de
+    modo que comprobar una colisión cuesta lo mismo sin importar la longitud del jugador ni el número de
+    obstáculos o enemigos.
+    Las celdas deben estar dentro del tablero: los choques contra los límites se comprueban antes
+    con `utils.check_collision`.
+    """
+
+    def __init__(self, window_x, window_y):
+        """
+        Crea una rejilla vacía para un tablero del tamaño dado.
+
+        Args:
+            window_x (int): La anchura del tablero en píxeles.
+            window_y (int): La altura del tablero en píxeles.
+        """
+        self.columns = window_x // CELL_SIZE
+        self.rows = window_y // CELL_SIZE
+        self.body = bytearray(self.columns * self.rows)
+        self.obstacles = bytearray(self.columns * self.rows)
+        # Los enemigos pueden acumularse en una celda: 16 bits por celda en lugar de 8
+        self.enemies = array('H', [0]) * (self.columns * self.rows)
+
+    def cell(self, position):
+        """
+        Devuelve el índice de celda de una posición (x, y) en píxeles.
+        """
+        return position[0] // CELL_SIZE + position[1] // CELL_SIZE * self.columns
+
+    def position(self, cell):
+        """
+        Devuelve la posición (x, y) en píxeles de un índice de celda.
+        """
+        row, column = divmod(cell, self.columns)
+        return (column * CELL_SIZE, row * CELL_SIZE)
+
+    def add_body(self, cell):
+        self.body[cell] += 1
+
+    def remove_body(self, cell):
+        self.body[cell] -= 1
+
+    def add_obstacle(self, cell):
+        self.obstacles[cell] += 1
+
+    def add_enemy(self, cell):
+        self.enemies[cell] += 1
+
+    def remove_enemy(self, cell):
+        self.enemies[cell] -= 1
+
+    def body_count(self, cell):
+        """
+        Devuelve cuántos segmentos del cuerpo ocupan la celda.
+        """
+        return self.body[cell]
+
+    def obstacle_count(self, cell):
+        """
+        Devuelve cuántos obstáculos ocupan la celda.
+        """
+        return self.obstacles[cell]
+
+    def enemy_count(self, cell):
+        """
+        Devuelve cuántos enemigos ocupan la celda.
+        """
+        return self.enemies[cell]
+
+class FreeCells:
+    """
+    Conjunto de celdas libres donde pueden aparecer la fruta, los power-ups y los obstáculos.
+
+    Las celdas se guardan en un arreglo denso junto con un índice inverso (celda -> posición en el
+    arreglo), así que agregar, quitar y elegir una celda al azar cuesta O(1) aunque el tablero esté
+    casi lleno. Solo se consideran las celdas donde `utils.spawn_item` puede generar elementos:
+    todas menos la primera fila y la primera columna.
+    """
+
+    def __init__(self, grid):
+        """
+        Crea el conjunto con todas las celdas generables que no ocupan el cuerpo ni los obstáculos.
+
+        Args:
+            grid (OccupancyGrid): La rejilla del tablero.
+        """
+        self.grid = grid
+        self.cells = []
+        self.index = array('i', [-1]) * (grid.columns * grid.rows)
+        for row in range(1, grid.rows):
+            for cell in range(row * grid.columns + 1, (row + 1) * grid.columns):
+                if not grid.body[cell] and not grid.obstacles[cell]:
+                    self.add(cell)
+
+    @classmethod
+    def from_cells(cls, grid, cells):
+        """
+        Crea el conjunto con las celdas dadas, en ese orden, sin recorrer el tablero.
+
+        El orden del arreglo decide qué celda elige `pop_random()`, así que restaurar una partida
+        guardada necesita el mismo orden para generar los mismos elementos.
+
+        Args:
+            grid (OccupancyGrid): La rejilla del tablero.
+            cells (iterable): Los índices de las celdas libres.
+        """
+        free_cells = cls.__new__(cls)
+        free_cells.grid = grid
+        free_cells.cells = list(cells)
+        free_cells.index = index = array('i', [-1]) * (grid.columns * grid.rows)
+        for i, cell in enumerate(free_cells.cells):
+            index[cell] = i
+        return free_cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.index[cell] >= 0
+
+    def spawnable(self, cell):
+        """
+        Indica si la celda está fuera de la primera fila y de la primera columna.
+        """
+        return cell >= self.grid.columns and cell % self.grid.columns != 0
+
+    def add(self, cell):
+        """
+        Marca la celda como libre. Las celdas no generables se ignoran.
+        """
+        if self.index[cell] < 0 and self.spawnable(cell):
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        """
+        Marca la celda como ocupada, intercambiándola con la última del arreglo.
+        """
+        i = self.index[cell]
+        if i < 0:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.index[last] = i
+        self.index[cell] = -1
+
+    def pop_random(self, rng):
+        """
+        Elige una celda libre al azar y la marca como ocupada.
+
+        Args:
+            rng (random.Random): El generador de números aleatorios a utilizar.
+
+        Returns:
+            int: El índice de la celda elegida, o None si no quedan celdas libres.
+        """
+        if not self.cells:
+            return None
+        cell = self.cells[rng.randrange(len(self.cells))]
+        self.discard(cell)
+        return cell
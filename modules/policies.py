@@ -0,0 +1,51 @@
+from modules import utils
+
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+
+def choose(state):
+    """
+    Política simple para partidas sin ventana: avanza hacia la fruta evitando los choques inmediatos.
+
+    Entre las direcciones válidas elige la que más acerca la cabeza a la fruta y descarta las que
+    chocarían en el próximo tick contra un límite, un obstáculo visible, el cuerpo o un enemigo.
+
+    Args:
+        state (engine.GameState): La partida en curso.
+
+    Returns:
+        str: La dirección a seguir: 'UP', 'DOWN', 'LEFT' o 'RIGHT'.
+    """
+    target = state.fruit_position or state.player_position
+    best, best_key = state.direction, None
+    # Los enemigos se mueven en el mismo tick que la cabeza: se evita la celda a la que llegarán
+    enemy_cells = set(state.enemies.next_cells()) if len(state.enemies) else set()
+    for direction in DIRECTIONS:
+        if utils.validate_direction(direction, state.direction) != direction:
+            continue
+        position = utils.move_player(state.player_position, direction)
+        distance = abs(position[0] - target[0]) + abs(position[1] - target[1])
+        key = (not is_safe(state, position, enemy_cells), distance)
+        if best_key is None or key < best_key:
+            best, best_key = direction, key
+    return best
+
+def is_safe(state, position, enemy_cells=()):
+    """
+    Indica si la cabeza puede entrar en la posición sin perder una vida.
+
+    Args:
+        state (engine.GameState): La partida en curso.
+        position (tuple): La posición (x, y) a la que entraría la cabeza.
+        enemy_cells (set, optional): Las celdas que ocuparán los enemigos después del próximo tick.
+    """
+    if utils.check_collision(position, state.board_x, state.board_y):
+        return False
+    cell = state.grid.cell(position)
+    if cell in enemy_cells:
+        return False
+    if not state.obstacles_hidden and state.grid.obstacles[cell]:
+        return False
+    # La cola se mueve en el mismo tick, salvo que se coma la fruta
+    if state.grid.body[cell]:
+        return cell == state.player_body[-1] and position != state.fruit_position and state.grid.body[cell] == 1
+    return True
@@ -0,0 +1,120 @@
+import csv
+import json
+import time
+from collections import deque
+from modules import display
+
+SECTIONS = ('events', 'simulation', 'drawing', 'hud', 'display_update')
+
+class FrameProfiler:
+    """
+    Mide cuánto tiempo ocupa cada sección de un cuadro del bucle principal.
+
+    Cada cuadro empieza con `start_frame()`; después de cada sección se llama a `lap(nombre)`, que
+    atribuye a esa sección el tiempo transcurrido desde la marca anterior, y `end_frame()` cierra el
+    cuadro. `mark()` mueve la marca sin atribuir el tiempo a ninguna sección, para esperas como la de
+    `Clock.tick`, que cuentan solo en 'frame'. Se conservan los últimos `window` cuadros para calcular
+    percentiles, dibujar el resumen en pantalla y exportarlo a CSV o JSON.
+    """
+
+    def __init__(self, window=600, refresh=30):
+        """
+        Args:
+            window (int, optional): Los cuadros que se conservan. Por defecto 600.
+            refresh (int, optional): Cada cuántos cuadros se recalcula el texto en pantalla. Por defecto 30.
+        """
+        self.frames = deque(maxlen=window)
+        self.refresh = refresh
+        self.current = None
+        self.last_mark = 0.0
+        self.frame_start = 0.0
+        self.overlay_lines = []
+
+    def start_frame(self):
+        self.current = dict.fromkeys(SECTIONS, 0.0)
+        self.frame_start = self.last_mark = time.perf_counter()
+
+    def mark(self):
+        """
+        Mueve la marca al momento actual sin atribuir el tiempo transcurrido a ninguna sección.
+        """
+        self.last_mark = time.perf_counter()
+
+    def lap(self, section):
+        """
+        Suma a la sección el tiempo transcurrido desde la marca anterior.
+        """
+        now = time.perf_counter()
+        self.current[section] += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        """
+        Cierra el cuadro; el tiempo sin sección (por ejemplo la espera de `Clock.tick`) cuenta solo en 'frame'.
+        """
+        self.current['frame'] = time.perf_counter() - self.frame_start
+        self.frames.append(self.current)
+        if len(self.frames) % self.refresh == 0:
+            self.overlay_lines = self.summary_lines()
+
+    def percentiles(self, section='frame'):
+        """
+        Devuelve los percentiles 50, 95 y 99 de una sección en milisegundos.
+
+        Returns:
+            tuple: (p50, p95, p99), o (0, 0, 0) si todavía no hay cuadros.
+        """
+        values = sorted(frame[section] for frame in self.frames)
+        if not values:
+            return (0.0, 0.0, 0.0)
+        last = len(values) - 1
+        return tuple(values[round(last * q)] * 1000 for q in (0.50, 0.95, 0.99))
+
+    def summary(self):
+        """
+        Devuelve los percentiles de todas las secciones y del cuadro completo.
+
+        Returns:
+            dict: Para cada sección, un diccionario con 'p50', 'p95' y 'p99' en milisegundos.
+        """
+        return {
+            section: dict(zip(('p50', 'p95', 'p99'), self.percentiles(section)))
+            for section in SECTIONS + ('frame',)
+        }
+
+    def summary_lines(self):
+        lines = ['frame  p50 %.2f  p95 %.2f  p99 %.2f ms' % self.percentiles('frame')]
+        for section in SECTIONS:
+            lines.append('%s  p50 %.2f  p95 %.2f  p99 %.2f' % ((section,) + self.percentiles(section)))
+        return lines
+
+    def draw_overlay(self, window, color, font='courier new', size=14):
+        """
+        Dibuja el resumen de percentiles en la esquina inferior izquierda de la ventana.
+
+        Returns:
+            list: Los rectángulos ocupados por el texto.
+        """
+        rects = []
+        y = window.get_height() - len(self.overlay_lines) * (size + 2)
+        for line in self.overlay_lines:
+            surface = display.render_text(line, color, font, size)
+            rects.append(window.blit(surface, (0, y)))
+            y += size + 2
+        return rects
+
+    def export(self, filename):
+        """
+        Exporta los cuadros conservados: un CSV con una fila por cuadro si el archivo termina en '.csv',
+        o un JSON con el resumen de percentiles y los cuadros en otro caso.
+        """
+        columns = SECTIONS + ('frame',)
+        if filename.endswith('.csv'):
+            with open(filename, mode='w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(columns)
+                for frame in self.frames:
+                    writer.writerow([frame[column] for column in columns])
+        else:
+            with open(filename, 'w') as file:
+                json.dump({'summary': self.summary(), 'frames': list(self.frames)}, file, indent=4)
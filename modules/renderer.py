@@ -0,0 +1,275 @@
+import itertools
+from collections import OrderedDict
+import pygame
+from modules import settings, display
+from modules.grid import CELL_SIZE
+
+# Fracción de las celdas visibles a partir de la cual se redibuja el cuadro completo en lugar de celda por celda
+FULL_REDRAW_FRACTION = 8
+
+# Lado en píxeles de los trozos de la capa fija (un múltiplo de CELL_SIZE) y cuántos se conservan
+CHUNK_SIZE = 320
+MAX_CHUNKS = 128
+
+class Renderer:
+    """
+    Dibuja una partida en la ventana actualizando solo las áreas que cambiaron.
+
+    En un tick normal solo cambian la cabeza nueva, la celda que dejó la cola, la fruta, el power-up y
+    el marcador, así que en lugar de redibujar toda la ventana se restaura el fondo de esas celdas,
+    se vuelve a pintar su contenido y se devuelven sus rectángulos para `pygame.display.update(rects)`.
+    El cuadro completo se redibuja al empezar una partida, cuando los obstáculos se ocultan o reaparecen
+    y cuando cambió más de 1/`FULL_REDRAW_FRACTION` de las celdas.
+
+    El tablero puede ser más grande que la ventana: una cámara sigue a la cabeza y solo se dibuja lo
+    que cae dentro de la ventana. Cuando la cámara se mueve se redibuja el cuadro completo; si el
+    tablero mide lo mismo que la ventana la cámara no se mueve nunca.
+
+    El fondo (repetido como mosaico) y los obstáculos estáticos se componen en una capa fija dividida en
+    trozos de `CHUNK_SIZE` píxeles (unos con obstáculos y otros sin ellos), que se crean la primera vez
+    que entran en la ventana, se conservan los `MAX_CHUNKS` usados más recientemente y se descartan
+    cuando cambian los obstáculos; así restaurar una celda cuesta un único blit y el cuadro completo
+    unos pocos, sin importar cuántos obstáculos haya ni el tamaño del tablero.
+
+    El cuadro completo recorre solo las filas visibles de la rejilla para encontrar el cuerpo y los
+    enemigos, así que su costo depende del área visible y no de la longitud del jugador ni del número
+    de enemigos. Los segmentos y los enemigos se dibujan con baldosas pre-renderizadas, enviadas en una
+    sola llamada a `Surface.blits`, sin crear un pygame.Rect por segmento.
+    """
+
+    def __init__(self, window, background_image, player_color, profiler=None):
+        """
+        Args:
+            window (pygame.Surface): La superficie de la ventana del juego.
+            background_image (pygame.Surface): La imagen de fondo de la partida.
+            player_color (tuple): El color RGB del cuerpo del jugador.
+            profiler (profiler.FrameProfiler, optional): Si se pasa, mide el dibujo y el marcador por
+                                                         separado y muestra el resumen en pantalla.
+        """
+        self.window = window
+        self.background_image = background_image
+        self.player_color = player_color
+        self.profiler = profiler
+        self.state = None
+        self.obstacles_hidden = False
+        self.camera = (0, 0)
+        self.hud_rects = []
+        self.chunks = OrderedDict()
+        self.chunk_obstacles = None
+        self.segment = pygame.Surface((CELL_SIZE, CELL_SIZE)).convert()
+        self.segment.fill(player_color)
+        self.enemy = pygame.Surface((CELL_SIZE, CELL_SIZE)).convert()
+        self.enemy.fill(settings.colors['blue'])
+
+    def draw(self, state):
+        """
+        Dibuja el estado actual de la partida.
+
+        Args:
+            state (engine.GameState): La partida a dibujar.
+
+        Returns:
+            list: Los rectángulos de la ventana que cambiaron, para pasarlos a `pygame.display.update()`.
+        """
+        dirty_cells = state.take_dirty_cells()
+        camera = self.follow(state)
+        # Con muchas celdas cambiadas (por ejemplo miles de enemigos) un cuadro completo, que son unos
+        # pocos blits de la capa fija y dos llamadas a `blits`, cuesta menos que redibujarlas una por una
+        visible_cells = (self.window.get_width() // CELL_SIZE) * (self.window.get_height() // CELL_SIZE)
+        many_changes = len(dirty_cells) > visible_cells // FULL_REDRAW_FRACTION
+        if (state is not self.state or state.obstacles_hidden != self.obstacles_hidden
+                or camera != self.camera or many_changes):
+            self.state = state
+            # Desde ahora la partida anota las celdas que cambian para redibujar solo esas
+            state.track_dirty = True
+            self.obstacles_hidden = state.obstacles_hidden
+            self.camera = camera
+            rects = [self.draw_full(state)]
+        else:
+            rects = []
+            for cell in dirty_cells:
+                rect = self.draw_cell(state, cell)
+                if rect is not None:
+                    rects.append(rect)
+
+            # El marcador se redibuja cada cuadro sobre el fondo y las celdas que tapaba
+            for rect in self.hud_rects:
+                self.restore(state, rect)
+                rects.append(rect)
+        if self.profiler:
+            self.profiler.lap('drawing')
+
+        self.hud_rects = self.draw_hud(state)
+        rects.extend(self.hud_rects)
+        if self.profiler:
+            self.profiler.lap('hud')
+        return rects
+
+    def follow(self, state):
+        """
+        Devuelve la posición de la cámara que centra la cabeza en la ventana sin salirse del tablero.
+
+        Returns:
+            tuple: La esquina superior izquierda de la ventana en píxeles del tablero.
+        """
+        view_x, view_y = self.window.get_size()
+        head_x, head_y = state.player_position
+        x = min(max(head_x - view_x // 2 // CELL_SIZE * CELL_SIZE, 0), max(state.board_x - view_x, 0))
+        y = min(max(head_y - view_y // 2 // CELL_SIZE * CELL_SIZE, 0), max(state.board_y - view_y, 0))
+        return (x, y)
+
+    def draw_full(self, state):
+        """
+        Redibuja la ventana completa.
+
+        Returns:
+            pygame.Rect: El rectángulo de toda la ventana.
+        """
+        camera_x, camera_y = self.camera
+        view_x, view_y = self.window.get_size()
+        if state.board_x - camera_x < view_x or state.board_y - camera_y < view_y:
+            self.window.fill(settings.colors['black'])
+        last_x = min(camera_x + view_x, state.board_x) - 1
+        last_y = min(camera_y + view_y, state.board_y) - 1
+        for j in range(camera_y // CHUNK_SIZE, last_y // CHUNK_SIZE + 1):
+            for i in range(camera_x // CHUNK_SIZE, last_x // CHUNK_SIZE + 1):
+                self.window.blit(self.chunk(state, i, j), (i * CHUNK_SIZE - camera_x, j * CHUNK_SIZE - camera_y))
+
+        # Los obstáculos visibles ya están en la capa fija y se dibujan por encima del cuerpo
+        grid = state.grid
+        covered = None if state.obstacles_hidden else grid.obstacles
+        segments = [(self.segment, (x - camera_x, y - camera_y))
+                    for cell, x, y in self.visible(grid, grid.body) if covered is None or not covered[cell]]
+        self.window.blits(segments, doreturn=False)
+        if state.fruit_position is not None:
+            pygame.draw.rect(self.window, settings.colors['white'], pygame.Rect(state.fruit_position[0] - camera_x, state.fruit_position[1] - camera_y, CELL_SIZE, CELL_SIZE))
+        if not state.power_up_spawn and state.power_up_position is not None:
+            pygame.draw.rect(self.window, settings.colors['yellow'], pygame.Rect(state.power_up_position[0] - camera_x, state.power_up_position[1] - camera_y, CELL_SIZE, CELL_SIZE))
+        # Los enemigos se dibujan por encima de todo, incluso de los obstáculos
+        self.window.blits([(self.enemy, (x - camera_x, y - camera_y)) for _, x, y in self.visible(grid, grid.enemies)], doreturn=False)
+        return self.window.get_rect()
+
+    def visible(self, grid, counts):
+        """
+        Recorre las celdas visibles con un conteo distinto de cero en `counts` (por ejemplo `grid.body`).
+
+        Returns:
+            iterator: Tuplas (celda, x, y) con la posición en píxeles del tablero.
+        """
+        camera_x, camera_y = self.camera
+        view_x, view_y = self.window.get_size()
+        first_column = camera_x // CELL_SIZE
+        last_column = min((camera_x + view_x - 1) // CELL_SIZE, grid.columns - 1)
+        first_row = camera_y // CELL_SIZE
+        last_row = min((camera_y + view_y - 1) // CELL_SIZE, grid.rows - 1)
+        for row in range(first_row, last_row + 1):
+            start = row * grid.columns
+            cells = range(start + first_column, start + last_column + 1)
+            # compress recorre la fila en C y solo devuelve las celdas ocupadas
+            for cell in itertools.compress(cells, counts[cells.start:cells.stop]):
+                yield cell, (cell - start) * CELL_SIZE, row * CELL_SIZE
+
+    def draw_cell(self, state, cell):
+        """
+        Restaura el fondo de una celda y dibuja lo que la ocupa, respetando el orden del cuadro completo:
+        cuerpo, fruta, power-up, obstáculo y enemigo.
+
+        Returns:
+            pygame.Rect: El rectángulo de la celda en la ventana, o None si la celda no está a la vista.
+        """
+        grid = state.grid
+        x, y = grid.position(cell)
+        rect = pygame.Rect(x - self.camera[0], y - self.camera[1], CELL_SIZE, CELL_SIZE)
+        if not self.window.get_rect().colliderect(rect):
+            return None
+        area = pygame.Rect(x % CHUNK_SIZE, y % CHUNK_SIZE, CELL_SIZE, CELL_SIZE)
+        self.window.blit(self.chunk(state, x // CHUNK_SIZE, y // CHUNK_SIZE), rect, area)
+        if grid.enemies[cell]:
+            self.window.blit(self.enemy, rect)
+            return rect
+        if not state.obstacles_hidden and grid.obstacles[cell]:
+            return rect
+
+        color = None
+        if state.fruit_position == (x, y):
+            color = settings.colors['white']
+        if not state.power_up_spawn and state.power_up_position == (x, y):
+            color = settings.colors['yellow']
+        if color is not None:
+            pygame.draw.rect(self.window, color, rect)
+        elif grid.body[cell]:
+            self.window.blit(self.segment, rect)
+        return rect
+
+    def chunk(self, state, i, j):
+        """
+        Devuelve un trozo de la capa fija con el fondo y, si están visibles, los obstáculos de la partida.
+
+        Args:
+            state (engine.GameState): La partida.
+            i, j (int): La columna y la fila del trozo, en unidades de `CHUNK_SIZE` píxeles.
+
+        Returns:
+            pygame.Surface: El trozo, recortado en los bordes del tablero.
+        """
+        if state.static_obstacles is not self.chunk_obstacles:
+            self.chunks.clear()
+            self.chunk_obstacles = state.static_obstacles
+        key = (state.obstacles_hidden, i, j)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        left, top = i * CHUNK_SIZE, j * CHUNK_SIZE
+        width, height = min(CHUNK_SIZE, state.board_x - left), min(CHUNK_SIZE, state.board_y - top)
+        chunk = pygame.Surface((width, height)).convert()
+        chunk.fill(settings.colors['black'])
+        image_x, image_y = self.background_image.get_size()
+        for tile_y in range(top // image_y * image_y, top + height, image_y):
+            for tile_x in range(left // image_x * image_x, left + width, image_x):
+                chunk.blit(self.background_image, (tile_x - left, tile_y - top))
+        if not state.obstacles_hidden:
+            grid = state.grid
+            last_column = min((left + width - 1) // CELL_SIZE, grid.columns - 1)
+            for row in range(top // CELL_SIZE, min((top + height - 1) // CELL_SIZE, grid.rows - 1) + 1):
+                start = row * grid.columns
+                cells = range(start + left // CELL_SIZE, start + last_column + 1)
+                for cell in itertools.compress(cells, grid.obstacles[cells.start:cells.stop]):
+                    rect = pygame.Rect((cell - start) * CELL_SIZE - left, row * CELL_SIZE - top, CELL_SIZE, CELL_SIZE)
+                    pygame.draw.rect(chunk, settings.colors['red'], rect)
+
+        self.chunks[key] = chunk
+        if len(self.chunks) > MAX_CHUNKS:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def restore(self, state, rect):
+        """
+        Redibuja las celdas que cubren un rectángulo de la ventana.
+        """
+        grid = state.grid
+        camera_x, camera_y = self.camera
+        first_column = max((rect.left + camera_x) // CELL_SIZE, 0)
+        last_column = min((rect.right - 1 + camera_x) // CELL_SIZE, grid.columns - 1)
+        first_row = max((rect.top + camera_y) // CELL_SIZE, 0)
+        last_row = min((rect.bottom - 1 + camera_y) // CELL_SIZE, grid.rows - 1)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                self.draw_cell(state, row * grid.columns + column)
+
+    def draw_hud(self, state):
+        """
+        Dibuja la puntuación, las vidas y, si hay medición, el resumen de tiempos por cuadro.
+
+        Returns:
+            list: Los rectángulos ocupados por el marcador.
+        """
+        window_x = self.window.get_width()
+        rects = [
+            display.show_score(self.window, state.score, settings.colors['white'], 'times new roman', 20),
+            display.show_lives(self.window, state.lives, settings.colors['white'], 'times new roman', 20, window_x),
+        ]
+        if self.profiler:
+            rects.extend(self.profiler.draw_overlay(self.window, settings.colors['yellow']))
+        return rects
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import time
+
+# El resultado se imprime como JSON: el saludo de pygame no debe mezclarse en la salida
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+from modules import engine
+
+# Claves de la configuración que determinan la simulación
+GAME_KEYS = ('window_x', 'window_y', 'board_x', 'board_y', 'num_obstacles', 'num_enemies', 'initial_lives', 'power_up_duration', 'player_speed')
+
+class Recorder:
+    """
+    Graba una partida como su semilla más los cambios de dirección pedidos por el jugador.
+
+    Como `engine.GameState` es determinista dada la semilla y las entradas, esto alcanza para
+    reproducir la partida exacta. Solo se guardan los ticks en los que la dirección pedida cambia.
+    """
+
+    def __init__(self, config, seed):
+        """
+        Args:
+            config (dict): La configuración con la que se juega la partida.
+            seed (int): La semilla de la partida.
+        """
+        self.config = {key: config[key] for key in GAME_KEYS}
+        self.seed = seed
+        self.changes = []
+        self.last = 'RIGHT'
+        self.ticks = 0
+
+    @classmethod
+    def from_recording(cls, recording):
+        """
+        Sigue grabando una partida a partir de lo que ya se grabó, por ejemplo al retomarla desde una
+        instantánea de `snapshot`.
+
+        Args:
+            recording (dict): La grabación cargada con `load()`.
+        """
+        recorder = cls(game_config(recording), recording['seed'])
+        recorder.changes = [list(change) for change in recording['changes']]
+        recorder.ticks = recording['ticks']
+        if recorder.changes:
+            names = {direction[0]: direction for direction in ('UP', 'DOWN', 'LEFT', 'RIGHT')}
+            recorder.last = names[recorder.changes[-1][1]]
+        return recorder
+
+    def record(self, tick, change_to):
+        """
+        Registra la dirección pedida para un tick. Llamar antes de `GameState.step()`.
+
+        Args:
+            tick (int): El tick que se va a simular (`state.tick + 1`).
+            change_to (str): La dirección pedida por el jugador.
+        """
+        self.ticks = tick
+        if change_to != self.last:
+            self.changes.append([tick, change_to[0]])
+            self.last = change_to
+
+    def save(self, filename):
+        """
+        Guarda la grabación como JSON, creando la carpeta si hace falta.
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, 'w') as file:
+            json.dump({'seed': self.seed, 'config': self.config, 'ticks': self.ticks, 'changes': self.changes}, file)
+
+def load(filename):
+    """
+    Carga una grabación guardada con `Recorder.save()`.
+
+    Returns:
+        dict: La grabación, con las claves 'seed', 'config', 'ticks' y 'changes'.
+    """
+    with open(filename) as file:
+        return json.load(file)
+
+def game_config(recording):
+    """
+    Devuelve la configuración de la simulación de una grabación.
+
+    Las grabaciones anteriores a los enemigos o a los tableros grandes no guardan 'num_enemies' ni
+    'board_x'/'board_y': se jugaron sin enemigos y con el tablero del tamaño de la ventana.
+    """
+    return dict({'num_enemies': 0, 'board_x': 0, 'board_y': 0}, **recording['config'])
+
+def inputs(recording):
+    """
+    Recorre la dirección pedida en cada tick de la grabación, empezando por el tick 1.
+    """
+    names = {direction[0]: direction for direction in ('UP', 'DOWN', 'LEFT', 'RIGHT')}
+    changes = iter(recording['changes'])
+    change = next(changes, None)
+    change_to = 'RIGHT'
+    for tick in range(1, recording['ticks'] + 1):
+        while change is not None and change[0] == tick:
+            change_to = names[change[1]]
+            change = next(changes, None)
+        yield change_to
+
+def replay(recording):
+    """
+    Reproduce una grabación sin ventana, tan rápido como sea posible.
+
+    Returns:
+        engine.GameState: La partida en su estado final.
+    """
+    state = engine.GameState(game_config(recording), recording['seed'])
+    for change_to in inputs(recording):
+        state.step(change_to)
+        if state.game_over:
+            break
+    return state
+
+def replay_rendered(recording, speed=1.0):
+    """
+    Reproduce una grabación en una ventana, a `speed` veces la velocidad original.
+
+    Returns:
+        engine.GameState: La partida en su estado final.
+    """
+    import pygame
+    from modules import settings
+    from modules.renderer import Renderer
+    from modules.timestep import FixedTimestep
+
+    config = dict(settings.load_settings(), **game_config(recording))
+    pygame.init()
+    pygame.display.set_caption('Snake Game - Replay')
+    window = pygame.display.set_mode((config['window_x'], config['window_y']))
+    background_image = pygame.image.load(config['background_image']).convert()
+    renderer = Renderer(window, background_image, config['player_color'])
+    timestep = FixedTimestep(config['player_speed'] * speed, max_steps=max(5, int(speed) + 1))
+    clock = pygame.time.Clock()
+
+    state = engine.GameState(game_config(recording), recording['seed'])
+    remaining = inputs(recording)
+    change_to = None
+    clock.tick()
+    while not state.game_over:
+        elapsed = clock.tick(config['render_fps']) / 1000
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return state
+        for _ in range(timestep.advance(elapsed)):
+            change_to = next(remaining, None)
+            if change_to is None or state.game_over:
+                break
+            state.step(change_to)
+        pygame.display.update(renderer.draw(state))
+        if change_to is None:
+            break
+    time.sleep(1)
+    pygame.quit()
+    return state
+
+def main():
+    """
+    Punto de entrada de línea de comandos: `python -m modules.replay replays/partida.json [--render] [--speed 4]`.
+    """
+    parser = argparse.ArgumentParser(description='Reproduce una partida grabada.')
+    parser.add_argument('filename')
+    parser.add_argument('--render', action='store_true', help='mostrar la partida en una ventana')
+    parser.add_argument('--speed', type=float, default=1.0, help='multiplicador de velocidad con --render')
+    args = parser.parse_args()
+
+    recording = load(args.filename)
+    start = time.perf_counter()
+    state = replay_rendered(recording, args.speed) if args.render else replay(recording)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'score': state.score,
+        'ticks': state.tick,
+        'death_cause': state.death_cause,
+        'ticks_per_second': state.tick / elapsed if elapsed else None,
+    }))
+
+if __name__ == "__main__":
+    main()
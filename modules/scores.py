@@ -0,0 +1,222 @@
+import atexit
+import bisect
+import csv
+import os
+import queue
+import threading
+import time
+
+class ScoreWriter(threading.Thread):
+    """
+    Hilo que escribe las puntuaciones en el CSV fuera del hilo del juego.
+
+    Las filas se encolan con `write()` y el hilo las agrupa: espera la primera, toma todas las que ya
+    estén en la cola (hasta `batch_size`) y las agrega con una sola apertura del archivo. Después
+    sincroniza el archivo con el disco según `fsync`:
+
+    - 'always': después de cada lote.
+    - 'interval': como mucho una vez cada `fsync_interval` segundos.
+    - 'never': nunca; el sistema operativo decide cuándo escribir.
+    """
+
+    def __init__(self, filename, fsync='interval', fsync_interval=1.0, batch_size=256):
+        """
+        Args:
+            filename (str): El archivo CSV de puntuaciones.
+            fsync (str, optional): La política de sincronización. Por defecto 'interval'.
+            fsync_interval (float, optional): Los segundos entre sincronizaciones con 'interval'. Por defecto 1.0.
+            batch_size (int, optional): El máximo de filas por escritura. Por defecto 256.
+        """
+        super().__init__(name=f'ScoreWriter({filename})', daemon=True)
+        self.filename = filename
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.rows = queue.Queue()
+        self.last_sync = 0.0
+
+    def write(self, row):
+        """
+        Encola una fila para escribirla en segundo plano.
+        """
+        self.rows.put(row)
+
+    def flush(self):
+        """
+        Espera a que todas las filas encoladas estén escritas.
+        """
+        self.rows.join()
+
+    def close(self):
+        """
+        Escribe las filas pendientes, sincroniza el archivo y termina el hilo.
+        """
+        self.rows.put(None)
+        self.join()
+
+    def run(self):
+        closing = False
+        while not closing:
+            batch = [self.rows.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.rows.get_nowait())
+                except queue.Empty:
+                    break
+            closing = None in batch
+            rows = [row for row in batch if row is not None]
+            try:
+                if rows or closing:
+                    self._append(rows, force_sync=closing)
+            except OSError as e:
+                print(f"Error saving scores: {e}")
+            finally:
+                for _ in batch:
+                    self.rows.task_done()
+
+    def _append(self, rows, force_sync=False):
+        # Append mode para agregar datos al archivo, mantiene el contenido existente sin sobreescribirlo
+        with open(self.filename, mode='a', newline='') as file:
+            csv.writer(file).writerows(rows)
+            now = time.monotonic()
+            interval_due = self.fsync == 'interval' and now - self.last_sync >= self.fsync_interval
+            if self.fsync == 'always' or interval_due or (force_sync and self.fsync != 'never'):
+                file.flush()
+                os.fsync(file.fileno())
+                self.last_sync = now
+
+class ScoreStore:
+    """
+    Puntuaciones guardadas en un CSV de solo agregado, con un índice en memoria de las mejores.
+
+    El archivo se lee una sola vez, la primera vez que se consulta el almacén, y de ahí en más cada
+    puntuación nueva se inserta en el índice ordenado y se encola en un `ScoreWriter`, que la agrega al
+    final del archivo en segundo plano. Agregar una puntuación antes de esa primera consulta solo la
+    encola: el índice la incluye al leer el archivo, así que guardar al terminar una partida nunca
+    espera a que se lea el historial. El índice guarda solo las `top_size` mejores puntuaciones, así
+    que las consultas por página no dependen del tamaño del historial.
+    """
+
+    def __init__(self, filename='scores.csv', top_size=100):
+        """
+        Args:
+            filename (str, optional): El archivo CSV de puntuaciones. Por defecto 'scores.csv'.
+            top_size (int, optional): Cuántas de las mejores puntuaciones se indexan. Por defecto 100.
+        """
+        self.filename = filename
+        self.top_size = top_size
+        # Entradas (-puntuación, orden de llegada, nombre): ordenadas de mejor a peor, y entre empates
+        # la más antigua primero
+        self.top = []
+        self.count = 0
+        self.loaded = False
+        self.writer = None
+
+    def __len__(self):
+        self.load()
+        return self.count
+
+    def load(self):
+        """
+        Lee el archivo y construye el índice. Solo tiene efecto la primera vez.
+        """
+        if self.loaded:
+            return
+        self.loaded = True
+        # Las puntuaciones encoladas antes de leer el archivo entran al índice al leerlas del archivo
+        self.flush()
+        try:
+            with open(self.filename, mode='r', newline='') as file:
+                for row in csv.reader(file):
+                    self._index(row[0], int(row[1]))
+        except FileNotFoundError:
+            pass
+
+    def add(self, player_name, score):
+        """
+        Agrega una puntuación al índice y la encola para escribirla al final del archivo, sin esperar al disco.
+
+        Si el índice todavía no se construyó, la puntuación solo se encola y no se lee el archivo.
+
+        Args:
+            player_name (str): El nombre del jugador.
+            score (int): La puntuación del jugador.
+        """
+        if self.loaded:
+            self._index(player_name, score)
+        if self.writer is None:
+            self.writer = ScoreWriter(self.filename)
+            self.writer.start()
+        self.writer.write([player_name, score])
+
+    def flush(self):
+        """
+        Espera a que todas las puntuaciones agregadas estén escritas en el archivo.
+        """
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        """
+        Escribe las puntuaciones pendientes y detiene el hilo de escritura.
+        """
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def page(self, number, size):
+        """
+        Devuelve una página de las mejores puntuaciones, de mayor a menor.
+
+        Args:
+            number (int): El número de página, empezando en 0.
+            size (int): Las filas por página.
+
+        Returns:
+            list: Una lista de tuplas (nombre del jugador, puntuación).
+        """
+        self.load()
+        entries = self.top[number * size:(number + 1) * size]
+        return [(name, -negative_score) for negative_score, _, name in entries]
+
+    def pages(self, size):
+        """
+        Devuelve cuántas páginas de `size` filas hay en el índice.
+        """
+        self.load()
+        return max(1, -(-len(self.top) // size))
+
+    def _index(self, player_name, score):
+        entry = (-score, self.count, player_name)
+        self.count += 1
+        if len(self.top) < self.top_size:
+            bisect.insort(self.top, entry)
+        elif entry < self.top[-1]:
+            bisect.insort(self.top, entry)
+            self.top.pop()
+
+# Un almacén por archivo, compartido por todo el proceso
+_stores = {}
+
+def get_store(filename='scores.csv'):
+    """
+    Devuelve el almacén de puntuaciones del archivo, creándolo la primera vez.
+
+    Args:
+        filename (str, optional): El archivo CSV de puntuaciones. Por defecto 'scores.csv'.
+
+    Returns:
+        ScoreStore: El almacén del archivo.
+    """
+    store = _stores.get(filename)
+    if store is None:
+        store = _stores[filename] = ScoreStore(filename)
+    return store
+
+@atexit.register
+def close_all():
+    """
+    Escribe las puntuaciones pendientes de todos los almacenes. Se ejecuta al terminar el proceso.
+    """
+    for store in _stores.values():
+        store.close()
@@ -1,4 +1,7 @@
+import copy
 import json
+import os
+import tempfile
 
 colors = {
     'black': (0, 0, 0),
@@ -12,31 +15,227 @@ colors = {
 player_names = ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Hank"]
 
 
+# Tipo, valor por defecto y mínimo (None si no tiene) de cada ajuste de 'settings.json'
+SCHEMA = {
+    # La cabeza empieza en (100, 50): la ventana, y por lo tanto el tablero, debe contener esa celda
+    'window_x': (int, 720, 110),
+    'window_y': (int, 480, 60),
+    # El tablero puede ser más grande que la ventana, nunca más chico (ver `validate_board`); 0 significa
+    # del mismo tamaño que la ventana
+    'board_x': (int, 0, 0),
+    'board_y': (int, 0, 0),
+    'background_image': (str, './assets/background_main.jpg', None),
+    'background_menu': (str, './assets/background_menu.jpg', None),
+    'background_music': (str, './assets/main.mp3', None),
+    'lose_life_sound': (str, './assets/lose_life.ogg', None),
+    'fruit_sound': (str, './assets/gem.ogg', None),
+    'power_up_sound': (str, './assets/power_up.ogg', None),
+    'player_color': (list, [0, 0, 0], None),
+    'initial_lives': (int, 3, 1),
+    'num_obstacles': (int, 20, 0),
+    'num_enemies': (int, 10, 0),
+    'power_up_duration': (int, 5, 0),
+    'player_speed': (int, 10, 1),
+    'render_fps': (int, 60, 1),
+    'autopilot': (bool, False, None),
+    'replay_dir': (str, './replays', None),
+    'save_file': (str, './savegame.snk', None),
+    'profiling': (bool, False, None),
+    'profile_output': (str, './profile.json', None),
+    'asset_cache_dir': (str, './.asset_cache', None),
+    'difficulties': (dict, {
+        'easy': {'num_obstacles': 10, 'num_enemies': 5},
+        'medium': {'num_obstacles': 20, 'num_enemies': 10},
+        'hard': {'num_obstacles': 30, 'num_enemies': 20},
+    }, None),
+}
+
+def validate(key, value):
+    """
+    Comprueba que un ajuste tenga el tipo y el rango que espera el juego.
+
+    Las claves que no están en `SCHEMA` se aceptan sin comprobar.
+
+    Raises:
+        ValueError: Si el valor no es válido para la clave.
+    """
+    if key not in SCHEMA:
+        return
+    expected, _, minimum = SCHEMA[key]
+    # bool es una subclase de int: true/false no valen como número
+    if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+        raise ValueError(f"Setting '{key}' must be of type {expected.__name__}, got {value!r}")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"Setting '{key}' must be at least {minimum}, got {value!r}")
+    if key == 'player_color':
+        if len(value) != 3 or not all(isinstance(channel, int) and 0 <= channel <= 255 for channel in value):
+            raise ValueError(f"Setting 'player_color' must be three integers between 0 and 255, got {value!r}")
+    elif key == 'difficulties':
+        for difficulty, preset in value.items():
+            if not isinstance(preset, dict):
+                raise ValueError(f"Difficulty '{difficulty}' must be an object, got {preset!r}")
+            for preset_key, preset_value in preset.items():
+                if preset_key not in SCHEMA or preset_key == 'difficulties':
+                    raise ValueError(f"Difficulty '{difficulty}' sets unknown setting '{preset_key}'")
+                validate(preset_key, preset_value)
+
+def validate_board(values):
+    """
+    Comprueba que el tablero mida 0 (el tamaño de la ventana) o al menos lo mismo que la ventana.
+
+    Un tablero más chico que la ventana dejaría la celda inicial de la cabeza fuera del tablero y el
+    texto del marcador sobre una zona que el dibujo no limpia.
+
+    Args:
+        values (dict): Los ajustes completos.
+
+    Raises:
+        ValueError: Si el tablero es más chico que la ventana.
+    """
+    for board, window in (('board_x', 'window_x'), ('board_y', 'window_y')):
+        if values[board] and values[board] < values[window]:
+            raise ValueError(f"Setting '{board}' must be 0 or at least '{window}' ({values[window]}), got {values[board]!r}")
+
+class Settings:
+    """
+    Ajustes del juego leídos una sola vez de 'settings.json', validados y completados con los valores
+    por defecto de `SCHEMA`.
+
+    Los cambios se hacen en memoria con `update()` o `apply_difficulty()`: si algún valor cambia, el
+    archivo se reescribe de forma atómica (en un archivo temporal que después reemplaza al original,
+    así que un corte nunca deja el archivo a medias) y se avisa a los oyentes registrados con
+    `add_listener()`. Si nada cambia no se toca el disco.
+    """
+
+    def __init__(self, filename='settings.json'):
+        """
+        Args:
+            filename (str, optional): El archivo de ajustes. Por defecto 'settings.json'.
+
+        Raises:
+            ValueError: Si algún ajuste del archivo no es válido.
+        """
+        self.filename = filename
+        with open(filename) as config_file:
+            data = json.load(config_file)
+        self.values = {key: copy.deepcopy(default) for key, (_, default, _) in SCHEMA.items()}
+        for key, value in data.items():
+            validate(key, value)
+            self.values[key] = value
+        validate_board(self.values)
+        self.listeners = []
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def as_dict(self):
+        """
+        Devuelve una copia de los ajustes como diccionario, que se puede modificar sin afectar a los ajustes.
+        """
+        return copy.deepcopy(self.values)
+
+    def add_listener(self, listener):
+        """
+        Registra una función que se llama con un diccionario de los ajustes cambiados después de cada cambio.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def update(self, changes):
+        """
+        Cambia varios ajustes a la vez, guarda el archivo y avisa a los oyentes si alguno cambió.
+
+        Args:
+            changes (dict): Los ajustes nuevos por clave.
+
+        Returns:
+            dict: Los ajustes que cambiaron realmente.
+
+        Raises:
+            ValueError: Si algún valor no es válido; en ese caso no se cambia ninguno.
+        """
+        for key, value in changes.items():
+            validate(key, value)
+        validate_board(dict(self.values, **changes))
+        changed = {key: value for key, value in changes.items() if self.values.get(key) != value}
+        if not changed:
+            return changed
+        self.values.update(copy.deepcopy(changed))
+        self.save()
+        for listener in list(self.listeners):
+            listener(copy.deepcopy(changed))
+        return changed
+
+    def apply_difficulty(self, difficulty):
+        """
+        Aplica los valores de una dificultad de `settings['difficulties']`.
+
+        Returns:
+            dict: Los ajustes que cambiaron realmente.
+        """
+        return self.update(self.values['difficulties'][difficulty])
+
+    def save(self):
+        """
+        Escribe los ajustes en el archivo de forma atómica.
+        """
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.settings-', suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as config_file:
+                json.dump(self.values, config_file, indent=4)
+                config_file.flush()
+                os.fsync(config_file.fileno())
+            # mkstemp crea el archivo solo legible por su dueño: se conservan los permisos del original
+            if os.path.exists(self.filename):
+                os.chmod(temporary, os.stat(self.filename).st_mode & 0o777)
+            os.replace(temporary, self.filename)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+# Un objeto de ajustes por archivo, compartido por todo el proceso
+_settings = {}
+
+def get_settings(filename='settings.json'):
+    """
+    Devuelve los ajustes del archivo, leyéndolo solo la primera vez.
+
+    Args:
+        filename (str, optional): El archivo de ajustes. Por defecto 'settings.json'.
+
+    Returns:
+        Settings: Los ajustes del archivo.
+    """
+    instance = _settings.get(filename)
+    if instance is None:
+        instance = _settings[filename] = Settings(filename)
+    return instance
+
 def load_settings():
     """
-    Carga la configuración desde el archivo 'settings.json' y devuelve la configuración como un diccionario.
+    Devuelve una copia de la configuración de 'settings.json' como diccionario.
+
+    El archivo se lee y se valida una sola vez por proceso a través de `get_settings()`.
     """
-    with open('settings.json') as config_file:
-        return json.load(config_file)
-    
+    return get_settings().as_dict()
+
 def updateJsonFile(settings):
     """
     Una función para actualizar el archivo 'settings.json' con nuevos valores para 'num_obstacles' y 'num_enemies'.
-    
+
     Parameters:
     - settings: Un diccionario que contiene los nuevos valores de 'num_obstacles' y 'num_enemies'.
-    
+
     Returns:
     - None
     """
-    with open("settings.json", "r") as jsonFile:
-        data = json.load(jsonFile)
-
-    data['num_obstacles'] = settings['num_obstacles']
-    data['num_enemies'] = settings['num_enemies']
-
-    with open("settings.json", "w") as jsonFile:
-        json.dump(data, jsonFile, indent=4)
+    get_settings().update({'num_obstacles': settings['num_obstacles'], 'num_enemies': settings['num_enemies']})
 
 def update_settings(difficulty):
     """
@@ -46,10 +245,7 @@ def update_settings(difficulty):
     - difficulty: Cadena que indica el nivel de dificultad.
 
     Returns:
-    - None
+    - dict: Una copia de la configuración actualizada.
     """
-    with open('settings.json') as config_file:
-        settings = json.load(config_file)
-        settings['num_obstacles'] = settings['difficulties'][difficulty]['num_obstacles']
-        settings['num_enemies'] = settings['difficulties'][difficulty]['num_enemies']
-        updateJsonFile(settings)
+    get_settings().apply_difficulty(difficulty)
+    return load_settings()
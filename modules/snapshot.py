@@ -0,0 +1,298 @@
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections import deque
+
+# El resumen se imprime como JSON: el saludo de pygame no debe mezclarse en la salida
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+from modules import engine
+from modules.enemies import Enemies
+from modules.grid import CELL_SIZE, OccupancyGrid, FreeCells
+from modules.timers import Scheduler
+
+try:
+    import numpy as np
+except ImportError:
+    # Sin NumPy las cuentas de la rejilla se rehacen con un bucle
+    np = None
+
+SNAPSHOT_MAGIC = b'SNKG'
+SNAPSHOT_VERSION = 1
+# Magic, versión, banderas, board_x, board_y, power_up_ticks, semilla, tick, puntuación, vidas, contador de
+# los temporizadores, dirección, causa de la derrota, versión del RNG, cabeza (x, y), celdas de la fruta y
+# del power-up (-1 si no hay), gauss_next del RNG y el número de elementos de cada sección
+SNAPSHOT_HEADER = struct.Struct('<4sHHiiqqqqqqBBBxiiiid8I')
+
+# Bits de las banderas de la cabecera
+GAME_OVER = 1
+POWER_UP_SPAWN = 2
+POWER_UP_ACTIVE = 4
+OBSTACLES_HIDDEN = 8
+HAS_SEED = 16
+HAS_GAUSS = 32
+
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+DEATH_CAUSES = (None, 'wall', 'obstacle', 'self', 'enemy')
+
+def dumps(state):
+    """
+    Serializa una partida en el formato binario de las instantáneas.
+
+    Después de la cabecera fija vienen, alineadas a 8 bytes, las secciones como arreglos empaquetados:
+    las celdas del cuerpo y de los obstáculos, la columna, la fila y el desplazamiento de los enemigos,
+    las celdas libres en el orden de `grid.FreeCells`, el estado del generador de números aleatorios y
+    los temporizadores. Las cuentas de la rejilla no se guardan porque se deducen del cuerpo, los
+    obstáculos y los enemigos.
+
+    Args:
+        state (engine.GameState): La partida a guardar.
+
+    Returns:
+        bytes: La instantánea.
+    """
+    grid = state.grid
+    rng_version, rng_words, gauss_next = state.rng.getstate()
+    timers = state.timers
+    names = sorted({name for _, _, name in timers.queue} | set(timers.deadlines))
+    name_index = {name: i for i, name in enumerate(names)}
+    encoded_names = '\0'.join(names).encode()
+
+    enemies = state.enemies
+    sections = [
+        array('i', state.player_body),
+        array('i', [grid.cell(obstacle) for obstacle in state.static_obstacles]),
+        # `tobytes()` sirve igual para los arreglos de NumPy (int32) y de `array` ('i')
+        array('i', enemies.x.tobytes()),
+        array('i', enemies.y.tobytes()),
+        array('i', enemies.dx.tobytes()),
+        array('i', enemies.dy.tobytes()),
+        array('i', state.free_cells.cells),
+        array('I', rng_words),
+        array('q', [value for tick, counter, name in timers.queue for value in (tick, counter, name_index[name])]),
+        array('q', [value for name, tick in timers.deadlines.items() for value in (name_index[name], tick)]),
+        array('B', encoded_names),
+    ]
+
+    flags = ((GAME_OVER if state.game_over else 0) | (POWER_UP_SPAWN if state.power_up_spawn else 0)
+             | (POWER_UP_ACTIVE if state.power_up_active else 0) | (OBSTACLES_HIDDEN if state.obstacles_hidden else 0)
+             | (HAS_SEED if state.seed is not None else 0) | (HAS_GAUSS if gauss_next is not None else 0))
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, state.board_x, state.board_y, state.power_up_ticks,
+        state.seed or 0, state.tick, state.score, state.lives, timers.counter,
+        DIRECTIONS.index(state.direction), DEATH_CAUSES.index(state.death_cause), rng_version,
+        state.player_position[0], state.player_position[1],
+        grid.cell(state.fruit_position) if state.fruit_position is not None else -1,
+        grid.cell(state.power_up_position) if state.power_up_position is not None else -1,
+        gauss_next or 0.0,
+        len(state.player_body), len(state.static_obstacles), len(enemies), len(state.free_cells),
+        len(rng_words), len(timers.queue), len(timers.deadlines), len(encoded_names))
+
+    parts = [header, bytes(_padding(len(header)))]
+    for section in sections:
+        # Las secciones se guardan en little-endian, igual que la cabecera
+        if sys.byteorder == 'big':
+            section.byteswap()
+        data = section.tobytes()
+        parts.append(data)
+        parts.append(bytes(_padding(len(data))))
+    return b''.join(parts)
+
+def loads(data):
+    """
+    Restaura una partida desde una instantánea creada con `dumps()`.
+
+    Args:
+        data (bytes-like): La instantánea; puede ser un `mmap` o cualquier objeto con el protocolo de búfer.
+
+    Returns:
+        engine.GameState: La partida, en el mismo estado en que se guardó: seguir jugándola con las
+                          mismas entradas da el mismo resultado que la original.
+
+    Raises:
+        ValueError: Si los datos no son una instantánea de esta versión, están incompletos o tienen
+                    valores fuera de rango (por ejemplo, celdas fuera del tablero).
+    """
+    with memoryview(data) as view:
+        if len(view) < SNAPSHOT_HEADER.size:
+            raise ValueError('La instantánea está incompleta')
+        (magic, version, flags, board_x, board_y, power_up_ticks, seed, tick, score, lives, timer_counter,
+         direction, death_cause, rng_version, head_x, head_y, fruit, power_up, gauss_next,
+         body_count, obstacle_count, enemy_count, free_count, rng_count, queue_count, deadline_count,
+         name_count) = SNAPSHOT_HEADER.unpack_from(view)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError('Los datos no son una instantánea de la partida')
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f'Versión de instantánea no soportada: {version}')
+
+        offset = SNAPSHOT_HEADER.size + _padding(SNAPSHOT_HEADER.size)
+        sections = []
+        for typecode, count in (('i', body_count), ('i', obstacle_count), ('i', enemy_count), ('i', enemy_count),
+                                ('i', enemy_count), ('i', enemy_count), ('i', free_count), ('I', rng_count),
+                                ('q', queue_count * 3), ('q', deadline_count * 2), ('B', name_count)):
+            section = array(typecode)
+            end = offset + count * section.itemsize
+            if end > len(view):
+                raise ValueError('La instantánea está incompleta')
+            section.frombytes(view[offset:end])
+            if sys.byteorder == 'big':
+                section.byteswap()
+            sections.append(section)
+            offset = end + _padding(end)
+    body, obstacles, x, y, dx, dy, free, rng_words, queue, deadlines, encoded_names = sections
+
+    # Un archivo dañado debe fallar aquí con ValueError y no más tarde, en medio de la partida
+    if board_x < CELL_SIZE or board_y < CELL_SIZE:
+        raise ValueError(f'Tamaño de tablero inválido en la instantánea: {board_x}x{board_y}')
+    columns, rows = board_x // CELL_SIZE, board_y // CELL_SIZE
+    cells = columns * rows
+    # Toda celda generable está libre u ocupada por el cuerpo, un obstáculo, la fruta o el power-up: un
+    # tablero más grande que eso es un tamaño dañado, que además reservaría memoria sin límite
+    if (columns - 1) * (rows - 1) > free_count + body_count + obstacle_count + 2:
+        raise ValueError(f'Tamaño de tablero inválido en la instantánea: {board_x}x{board_y}')
+    if not body_count:
+        raise ValueError('La instantánea no tiene cuerpo')
+    if direction >= len(DIRECTIONS) or death_cause >= len(DEATH_CAUSES):
+        raise ValueError('La instantánea tiene una dirección o una causa de derrota inválida')
+    if not -1 <= fruit < cells or not -1 <= power_up < cells:
+        raise ValueError('La instantánea tiene elementos fuera del tablero')
+    for values, size in ((body, cells), (obstacles, cells), (free, cells), (x, columns), (y, rows)):
+        _check_range(values, 0, size)
+    for values in (dx, dy):
+        _check_range(values, -1, 2)
+    try:
+        names = encoded_names.tobytes().decode().split('\0') if name_count else []
+    except UnicodeDecodeError as e:
+        raise ValueError(f'Nombres de temporizadores inválidos en la instantánea: {e}') from None
+    _check_range(queue[2::3], 0, len(names))
+    _check_range(deadlines[0::2], 0, len(names))
+
+    # El estado se arma sin `GameState.__init__`, que generaría una partida nueva
+    state = engine.GameState.__new__(engine.GameState)
+    state.board_x, state.board_y = board_x, board_y
+    state.power_up_ticks = power_up_ticks
+    state.seed = seed if flags & HAS_SEED else None
+    state.rng = random.Random()
+    try:
+        state.rng.setstate((rng_version, tuple(rng_words), gauss_next if flags & HAS_GAUSS else None))
+    except (TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f'Estado del generador inválido en la instantánea: {e}') from None
+
+    state.grid = grid = OccupancyGrid(board_x, board_y)
+    state.player_position = (head_x, head_y)
+    state.player_body = deque(body)
+    _count(grid.body, body)
+    state.static_obstacles = [grid.position(cell) for cell in obstacles]
+    _count(grid.obstacles, obstacles)
+    state.obstacles_hidden = bool(flags & OBSTACLES_HIDDEN)
+    state.free_cells = FreeCells.from_cells(grid, free)
+
+    state.fruit_position = grid.position(fruit) if fruit >= 0 else None
+    state.power_up_position = grid.position(power_up) if power_up >= 0 else None
+    state.power_up_spawn = bool(flags & POWER_UP_SPAWN)
+    state.power_up_active = bool(flags & POWER_UP_ACTIVE)
+    state.enemies = Enemies.from_arrays(grid, x, y, dx, dy)
+
+    state.direction = DIRECTIONS[direction]
+    state.score, state.lives = score, lives
+    state.tick = tick
+    state.timers = Scheduler()
+    # La cola se guardó en el orden del montículo, así que sigue siendo un montículo válido
+    state.timers.queue = [(queue[i], queue[i + 1], names[queue[i + 2]]) for i in range(0, len(queue), 3)]
+    state.timers.deadlines = {names[deadlines[i]]: deadlines[i + 1] for i in range(0, len(deadlines), 2)}
+    state.timers.counter = timer_counter
+    state.game_over = bool(flags & GAME_OVER)
+    state.death_cause = DEATH_CAUSES[death_cause]
+    state.track_dirty = False
+    state.dirty_cells = set()
+    return state
+
+def save(state, filename):
+    """
+    Guarda una instantánea de la partida en un archivo, de forma atómica y creando la carpeta si hace falta.
+
+    No fuerza la escritura a disco con `fsync`, para que guardar en cada tick siga siendo barato.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.snapshot-', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as snapshot_file:
+            snapshot_file.write(dumps(state))
+        os.replace(temporary, filename)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+def load(filename):
+    """
+    Restaura una partida guardada con `save()`.
+
+    El archivo se proyecta en memoria con `mmap`, así que las secciones se copian directamente a sus
+    arreglos sin leer el archivo a un `bytes` intermedio.
+
+    Raises:
+        ValueError: Si el archivo no es una instantánea de esta versión o está incompleto.
+    """
+    with open(filename, 'rb') as snapshot_file:
+        if not os.fstat(snapshot_file.fileno()).st_size:
+            raise ValueError('La instantánea está vacía')
+        with mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return loads(data)
+
+def _count(counts, cells):
+    """
+    Suma a la cuenta de cada celda las veces que aparece en `cells`, un arreglo de celdas de tipo 'i'.
+    """
+    if np is not None:
+        np.frombuffer(counts, dtype=np.uint8)[:] += np.bincount(np.frombuffer(cells, dtype=np.int32), minlength=len(counts)).astype(np.uint8)
+        return
+    for cell in cells:
+        counts[cell] += 1
+
+def _check_range(values, low, high):
+    """
+    Lanza ValueError si algún valor del arreglo queda fuera de [low, high).
+    """
+    if len(values) and (min(values) < low or max(values) >= high):
+        raise ValueError('La instantánea tiene valores fuera de rango')
+
+def _padding(size):
+    # Bytes de relleno hasta el próximo múltiplo de 8
+    return -size % 8
+
+def main():
+    """
+    Punto de entrada de línea de comandos: `python -m modules.snapshot partida.snk`.
+
+    Muestra un resumen de la partida guardada.
+    """
+    parser = argparse.ArgumentParser(description='Muestra el contenido de una instantánea de partida.')
+    parser.add_argument('filename')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    state = load(args.filename)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'bytes': os.path.getsize(args.filename),
+        'load_ms': elapsed * 1000,
+        'board': [state.board_x, state.board_y],
+        'seed': state.seed,
+        'tick': state.tick,
+        'score': state.score,
+        'lives': state.lives,
+        'length': len(state.player_body),
+        'obstacles': len(state.static_obstacles),
+        'enemies': len(state.enemies),
+        'game_over': state.game_over,
+    }))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import heapq
+
+class Scheduler:
+    """
+    Cola de prioridad de eventos programados para un tick de la simulación.
+
+    Los eventos se identifican por nombre ('power_up_end', 'obstacles_show', ...). Programar un nombre
+    que ya estaba pendiente reemplaza su vencimiento anterior; las entradas viejas quedan en la cola y se
+    descartan al salir. Comprobar si algo vence en un tick solo mira la cima de la cola, así que cuesta
+    O(1) cuando no vence nada, y al depender únicamente del número de tick las repeticiones son exactas.
+    """
+
+    def __init__(self):
+        self.queue = []
+        self.deadlines = {}
+        self.counter = 0
+
+    def schedule(self, name, tick):
+        """
+        Programa un evento para que venza en el tick indicado.
+
+        Args:
+            name (str): El nombre del evento.
+            tick (int): El tick en el que vence.
+        """
+        self.deadlines[name] = tick
+        # El contador desempata eventos del mismo tick en el orden en que se programaron
+        heapq.heappush(self.queue, (tick, self.counter, name))
+        self.counter += 1
+
+    def pop_due(self, tick):
+        """
+        Saca de la cola los eventos que vencen en el tick indicado o antes.
+
+        Args:
+            tick (int): El tick actual.
+
+        Returns:
+            list: Los nombres de los eventos vencidos, en orden de vencimiento.
+        """
+        due = []
+        queue = self.queue
+        while queue and queue[0][0] <= tick:
+            deadline, _, name = heapq.heappop(queue)
+            if self.deadlines.get(name) == deadline:
+                del self.deadlines[name]
+                due.append(name)
+        return due
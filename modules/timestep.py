@@ -0,0 +1,45 @@
+class FixedTimestep:
+    """
+    Planificador de paso fijo: decide cuántos ticks de simulación corresponden al tiempo transcurrido.
+
+    El tiempo real de cada cuadro se acumula y se consume en pasos de `1 / steps_per_second` segundos,
+    de modo que la simulación avanza siempre a la misma velocidad y con los mismos pasos sin importar
+    a cuántos cuadros por segundo se dibuje la ventana.
+    """
+
+    def __init__(self, steps_per_second, max_steps=5):
+        """
+        Args:
+            steps_per_second (int): Los ticks de simulación por segundo (`player_speed`).
+            max_steps (int, optional): El máximo de ticks por cuadro. Si el cuadro se atrasa más que eso
+                                       (por ejemplo al arrastrar la ventana), el retraso se descarta
+                                       en lugar de acelerar el juego para recuperarlo. Por defecto 5.
+        """
+        self.step_time = 1.0 / steps_per_second
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        """
+        Suma el tiempo transcurrido y devuelve cuántos ticks deben simularse ahora.
+
+        Args:
+            elapsed (float): Los segundos transcurridos desde el cuadro anterior.
+
+        Returns:
+            int: El número de ticks a simular en este cuadro.
+        """
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.step_time)
+        if steps > self.max_steps:
+            self.accumulator = 0.0
+            return self.max_steps
+        self.accumulator -= steps * self.step_time
+        return steps
+
+    @property
+    def alpha(self):
+        """
+        La fracción del siguiente tick ya transcurrida, entre 0 y 1, para interpolar al dibujar.
+        """
+        return self.accumulator / self.step_time
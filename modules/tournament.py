@@ -0,0 +1,134 @@
+import argparse
+import importlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# El resultado se imprime como JSON: el saludo de pygame no debe mezclarse en la salida
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+from modules import settings, engine
+
+def parse_seeds(text):
+    """
+    Interpreta una lista de semillas como '0-99', '1,5,7' o una combinación como '0-9,100'.
+
+    Returns:
+        list: Las semillas en orden.
+    """
+    seeds = []
+    for part in text.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            seeds.extend(range(int(first), int(last) + 1))
+        elif part:
+            seeds.append(int(part))
+    return seeds
+
+def difficulty_config(config, difficulty):
+    """
+    Devuelve una copia de la configuración con los valores de la dificultad aplicados en memoria.
+    """
+    config = dict(config)
+    config.update(config['difficulties'][difficulty])
+    return config
+
+def play(config, difficulty, seed, policy, max_ticks):
+    """
+    Juega una partida sin ventana de principio a fin.
+
+    Args:
+        config (dict): La configuración base del juego.
+        difficulty (str): La dificultad, una clave de `config['difficulties']`.
+        seed (int): La semilla de la partida.
+        policy (str): El módulo de la política; debe definir `choose(state)` y devolver una dirección.
+        max_ticks (int): El máximo de ticks antes de dar la partida por sobrevivida.
+
+    Returns:
+        dict: La dificultad, la semilla, la puntuación, los ticks jugados y la causa de muerte
+              (None si la partida llegó a `max_ticks`).
+    """
+    choose = importlib.import_module(policy).choose
+    state = engine.GameState(difficulty_config(config, difficulty), seed)
+    while not state.game_over and state.tick < max_ticks:
+        state.step(choose(state))
+    return {
+        'difficulty': difficulty,
+        'seed': seed,
+        'score': state.score,
+        'ticks': state.tick,
+        'death_cause': state.death_cause,
+    }
+
+def _play(args):
+    return play(*args)
+
+def summarize(results):
+    """
+    Agrega los resultados por dificultad: partidas, puntuación media y máxima, ticks de supervivencia
+    y muertes por causa.
+
+    Returns:
+        dict: Un resumen por dificultad.
+    """
+    summary = {}
+    for result in results:
+        entry = summary.setdefault(result['difficulty'], {
+            'games': 0, 'total_score': 0, 'max_score': 0, 'total_ticks': 0, 'survived': 0, 'deaths': {},
+        })
+        entry['games'] += 1
+        entry['total_score'] += result['score']
+        entry['max_score'] = max(entry['max_score'], result['score'])
+        entry['total_ticks'] += result['ticks']
+        if result['death_cause'] is None:
+            entry['survived'] += 1
+        else:
+            entry['deaths'][result['death_cause']] = entry['deaths'].get(result['death_cause'], 0) + 1
+    for entry in summary.values():
+        entry['mean_score'] = entry['total_score'] / entry['games']
+        entry['mean_ticks'] = entry['total_ticks'] / entry['games']
+    return summary
+
+def run(seeds, difficulties, policy, max_ticks, workers=None):
+    """
+    Reparte las partidas (una por semilla y dificultad) entre procesos y devuelve sus resultados.
+
+    Args:
+        seeds (list): Las semillas a jugar.
+        difficulties (list): Las dificultades a jugar.
+        policy (str): El módulo de la política.
+        max_ticks (int): El máximo de ticks por partida.
+        workers (int, optional): El número de procesos. Por defecto uno por núcleo.
+
+    Returns:
+        list: Los resultados de `play()`, en el orden de las dificultades y las semillas.
+    """
+    config = settings.load_settings()
+    games = [(config, difficulty, seed, policy, max_ticks) for difficulty in difficulties for seed in seeds]
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_play, games, chunksize=max(1, len(games) // (workers * 4))))
+
+def main():
+    """
+    Punto de entrada de línea de comandos: `python -m modules.tournament --seeds 0-99 --difficulties easy hard`.
+
+    Imprime en formato JSON el resumen por dificultad y, con `--results`, cada partida.
+    """
+    config = settings.load_settings()
+    parser = argparse.ArgumentParser(description='Juega partidas de Snake sin ventana en paralelo.')
+    parser.add_argument('--seeds', default='0-99', help="semillas, por ejemplo '0-99' o '1,5,7'")
+    parser.add_argument('--difficulties', nargs='+', default=list(config['difficulties']), choices=list(config['difficulties']))
+    parser.add_argument('--policy', default='modules.policies', help='módulo que define choose(state)')
+    parser.add_argument('--max-ticks', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None, help='procesos (por defecto uno por núcleo)')
+    parser.add_argument('--results', action='store_true', help='incluir el resultado de cada partida')
+    args = parser.parse_args()
+
+    results = run(parse_seeds(args.seeds), args.difficulties, args.policy, args.max_ticks, args.workers)
+    output = {'summary': summarize(results)}
+    if args.results:
+        output['results'] = results
+    print(json.dumps(output, indent=4))
+
+if __name__ == "__main__":
+    main()
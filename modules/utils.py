@@ -1,23 +1,31 @@
 import random
 import pygame
-import time
-import csv
-from modules import settings
+from modules import settings, display, scores
 
-def spawn_item(window_x, window_y):
+def spawn_item(window_x, window_y, free_cells=None, rng=random):
     """
     Genera un elemento en una posición aleatoria dentro de las dimensiones de la ventana.
 
+    Si se pasa `free_cells`, la posición se elige entre las celdas libres y se marca como ocupada,
+    de modo que el elemento nunca aparece sobre el jugador, un obstáculo u otro elemento.
+
     Args:
         window_x (int): La anchura de la ventana.
         window_y (int): La altura de la ventana.
+        free_cells (grid.FreeCells, optional): Las celdas libres del tablero. Por defecto None (posición a ciegas).
+        rng (random.Random, optional): El generador de números aleatorios. Por defecto el módulo `random`.
 
     Returns:
-        list: Una lista que contiene las coordenadas x e y de la posición de spawn.
+        tuple: Una tupla que contiene las coordenadas x e y de la posición de spawn, o None si no quedan celdas libres.
     """
-    return [random.randrange(1, (window_x // 10)) * 10, random.randrange(1, (window_y // 10)) * 10]
+    if free_cells is None:
+        return (rng.randrange(1, (window_x // 10)) * 10, rng.randrange(1, (window_y // 10)) * 10)
+    cell = free_cells.pop_random(rng)
+    if cell is None:
+        return None
+    return free_cells.grid.position(cell)
 
-def create_obstacles(window_x, window_y, num_obstacles):
+def create_obstacles(window_x, window_y, num_obstacles, free_cells=None, rng=random):
     """
     Crea obstáculos generando elementos dentro de las dimensiones de la ventana un número especificado de veces.
 
@@ -25,33 +33,15 @@ def create_obstacles(window_x, window_y, num_obstacles):
         window_x (int): La anchura de la ventana.
         window_y (int): La altura de la ventana.
         num_obstacles (int): El número de obstáculos a crear.
+        free_cells (grid.FreeCells, optional): Las celdas libres del tablero. Por defecto None (posiciones a ciegas).
+        rng (random.Random, optional): El generador de números aleatorios. Por defecto el módulo `random`.
 
     Returns:
         list: Una lista de obstáculos, cada uno representado como una posición de spawn dentro de las dimensiones de la ventana.
+              Con `free_cells` no hay posiciones repetidas y la lista se corta si el tablero se llena.
     """
-    return [spawn_item(window_x, window_y) for _ in range(num_obstacles)]
-
-# def create_moving_enemies(window_x, window_y, num_enemies):
-#     """
-#     Genera una lista de enemigos en movimiento con posiciones y direcciones aleatorias.
-
-#     Args:
-#         window_x (int): La anchura de la ventana.
-#         window_y (int): La altura de la ventana.
-#         num_enemies (int): El número de enemigos a generar.
-
-#     Returns:
-#         list: Una lista de diccionarios que representan a los enemigos en movimiento. Cada diccionario contiene la
-#               posición y dirección de un enemigo.
-#     """
-#     enemies = []
-#     for _ in range(num_enemies):
-#         enemy = {
-#             "position": spawn_item(window_x, window_y),
-#             "direction": random.choice(['LEFT', 'RIGHT', 'UP', 'DOWN'])
-#         }
-#         enemies.append(enemy)
-#     return enemies
+    obstacles = [spawn_item(window_x, window_y, free_cells, rng) for _ in range(num_obstacles)]
+    return [obstacle for obstacle in obstacles if obstacle is not None]
 
 def validate_direction(change_to, direction):
     """
@@ -79,21 +69,25 @@ def move_player(position, direction):
     """
     Mueve al jugador en la dirección especificada.
 
+    La posición recibida no se modifica: se devuelve una tupla nueva, de modo que puede guardarse
+    directamente en el cuerpo del jugador o compararse con otras posiciones.
+
     Parameters:
         position (tuple): La posición actual del jugador como una tupla (x, y).
-        direction (str): La dirección en la que debe moverse el jugador. Debe ser una de las siguientes: 'ARRIBA', 'ABAJO', 'IZQUIERDA' o 'DERECHA'.
+        direction (str): La dirección en la que debe moverse el jugador. Debe ser una de las siguientes: 'UP', 'DOWN', 'LEFT' o 'RIGHT'.
     Returns:
         tuple: La posición actualizada del jugador como una tupla (x, y).
     """
+    x, y = position
     if direction == 'UP':
-        position[1] -= 10
+        return (x, y - 10)
     if direction == 'DOWN':
-        position[1] += 10
+        return (x, y + 10)
     if direction == 'LEFT':
-        position[0] -= 10
+        return (x - 10, y)
     if direction == 'RIGHT':
-        position[0] += 10
-    return position
+        return (x + 10, y)
+    return (x, y)
 
 def check_collision(position, window_x, window_y):
     """
@@ -133,6 +127,10 @@ def display_game_over(game_window, score, window_x, window_y):
     """
     Muestra la pantalla de fin de partida con la puntuación del jugador.
 
+    La puntuación se guarda en segundo plano y la pantalla se muestra hasta 4 segundos, o hasta que el
+    jugador pulse una tecla o haga clic. La función vuelve al terminar la espera para que se pueda
+    empezar otra partida sin reiniciar el proceso.
+
     Parameters:
         game_window: La superficie de la ventana donde se mostrará la pantalla de finalización del juego.
         score: La puntuación del jugador que se mostrará en la pantalla.
@@ -140,22 +138,47 @@ def display_game_over(game_window, score, window_x, window_y):
         window_y: La altura de la ventana.
 
     Returns:
-        None
+        bool: True si el jugador cerró la ventana durante la espera.
     """
-    font = pygame.font.SysFont('times new roman', 50)
-    game_over_surface = font.render('Your Score is : ' + str(score), True, (255, 255, 255))
+    game_over_surface = display.render_text('Your Score is : ' + str(score), (255, 255, 255), 'times new roman', 50)
     game_over_rect = game_over_surface.get_rect(center=(window_x / 2, window_y / 2))
     game_window.blit(game_over_surface, game_over_rect)
     pygame.display.flip()
     save_score(get_random_player_name(), score)
-    time.sleep(4)
-    pygame.quit()
-    quit()
+    return wait_for_input(4000)
+
+def wait_for_input(timeout):
+    """
+    Espera hasta que el jugador pulse una tecla, haga clic o cierre la ventana, como mucho `timeout` milisegundos.
+
+    A diferencia de time.sleep, la ventana sigue atendiendo eventos mientras tanto.
+
+    Parameters:
+        timeout (int): El tiempo máximo de espera en milisegundos.
+
+    Returns:
+        bool: True si el jugador cerró la ventana.
+    """
+    # Descarta las teclas pulsadas durante la partida para que no corten la espera
+    pygame.event.clear()
+    deadline = pygame.time.get_ticks() + timeout
+    while True:
+        remaining = deadline - pygame.time.get_ticks()
+        if remaining <= 0:
+            return False
+        event = pygame.event.wait(remaining)
+        if event.type == pygame.QUIT:
+            return True
+        if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+            return False
 
 def save_score(player_name, score, filename='scores.csv'):
     """
     Guarda la puntuación del jugador en un archivo CSV.
 
+    La puntuación se agrega a través del almacén de `scores`, que además actualiza su índice de
+    mejores puntuaciones sin volver a leer el archivo.
+
     Args:
         player_name (str): El nombre del jugador.
         score (int): La puntuación del jugador.
@@ -164,10 +187,7 @@ def save_score(player_name, score, filename='scores.csv'):
     Returns:
         None
     """
-    # Append mode para agregar datos al archivo, mantiene el contenido existente sin sobreescribirlo
-    with open(filename, mode='a', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow([player_name, score])
+    scores.get_store(filename).add(player_name, score)
 
 def get_random_player_name():
     """